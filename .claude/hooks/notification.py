@@ -39,7 +39,7 @@ except ImportError:
     COORDINATED_TTS_AVAILABLE = False
 
 # Log directory for notifications - adapted for observability system
-PROJECT_ROOT = Path(__file__).parent.parent.parent
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
 LOG_DIR = PROJECT_ROOT / "logs" / "hooks" / "notifications"
 DEBUG_LOG_DIR = PROJECT_ROOT / "logs" / "hooks" / "debug"
 
@@ -25,6 +25,7 @@ from utils.constants import ensure_session_log_dir
 from utils.http_client import send_tool_use_event
 # Add to imports (similar to PreToolUse)
 from utils.session_helpers import get_stored_session_id, get_project_name
+from utils.hook_server import get_serve_path, serve
 
 # Import observability system for event logging
 try:
@@ -47,7 +48,7 @@ except ImportError:
     pass  # dotenv is optional
 
 # Log directory for error events
-PROJECT_ROOT = Path(__file__).parent.parent.parent
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
 ERROR_LOG_DIR = PROJECT_ROOT / "logs" / "hooks" / "post_tool_use_errors"
 SUCCESS_LOG_DIR = PROJECT_ROOT / "logs" / "hooks" / "post_tool_use_success"
 
@@ -939,4 +940,8 @@ def main():
         sys.exit(0)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    serve_path = get_serve_path()
+    if serve_path:
+        serve(main, serve_path)
+    else:
+        main()
\ No newline at end of file
@@ -21,6 +21,7 @@ from typing import Dict, Any
 # Add session helpers for Phase 3 integration
 sys.path.append(os.path.join(os.path.dirname(__file__), 'utils'))
 from session_helpers import get_stored_session_id, get_project_name
+from hook_server import get_serve_path, serve
 
 # Import observability system for event logging
 try:
@@ -37,19 +38,9 @@ except ImportError:
     COORDINATED_TTS_AVAILABLE = False
 
 # Log directory for events
-PROJECT_ROOT = Path(__file__).parent.parent.parent
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
 LOG_DIR = PROJECT_ROOT / "logs" / "hooks" / "pre_tool_use"
 
-def extract_tool_info(hook_input: str) -> tuple[str, Dict[str, Any]]:
-    """Extract tool and parameter information from hook input."""
-    try:
-        data = json.loads(hook_input)
-        tool = data.get('tool', 'unknown')
-        parameters = data.get('parameters', {})
-        return tool, parameters
-    except Exception:
-        return 'unknown', {}
-
 def parse_mcp_tool_name(raw_tool_name: str) -> str:
     """Parse MCP tool names into friendly format."""
     if not raw_tool_name or raw_tool_name.strip() == "":
@@ -514,19 +505,12 @@ def log_tool_event(tool: str, parameters: Dict[str, Any], should_notify_result:
         # Silently fail logging
         pass
 
-def main():
-    """Main hook execution."""
-    
-    # Read hook input from stdin
-    try:
-        hook_input = sys.stdin.read().strip()
-        if not hook_input:
-            sys.exit(0)
-    except Exception:
-        sys.exit(0)
+def handle(input_data: Dict[str, Any]) -> int:
+    """Process one parsed hook input; returns the exit code."""
     
     # Extract tool information
-    tool, parameters = extract_tool_info(hook_input)
+    tool = input_data.get('tool', 'unknown')
+    parameters = input_data.get('parameters', {})
     
     # Determine if we should notify
     should_notify_result = should_notify(tool, parameters)
@@ -573,7 +557,32 @@ def main():
             notify_tts(message, priority, tool)
     
     # Always exit successfully (don't block tool execution)
-    sys.exit(0)
+    return 0
+
+def main():
+    """Main hook execution."""
+    
+    # Read hook input from stdin
+    try:
+        hook_input = sys.stdin.read().strip()
+        if not hook_input:
+            sys.exit(0)
+    except Exception:
+        sys.exit(0)
+    
+    # Unparseable or non-object input is handled as an unknown tool
+    try:
+        input_data = json.loads(hook_input)
+    except Exception:
+        input_data = {}
+    if not isinstance(input_data, dict):
+        input_data = {}
+    
+    sys.exit(handle(input_data))
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    serve_path = get_serve_path()
+    if serve_path:
+        serve(main, serve_path)
+    else:
+        main()
\ No newline at end of file
@@ -14,7 +14,9 @@ Sends custom events to the observability server.
 import argparse
 import json
 import sys
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 from utils.constants import ensure_session_log_dir
 from utils.http_client import send_event_to_server, create_hook_event
 
@@ -47,6 +49,40 @@ def extract_project_name_from_cwd(cwd: str) -> str:
     return project_name
 
 
+# Tool inference rules as (required keys, excluded keys, tool name), checked
+# in order; the first rule whose required keys are all present in tool_input
+# and whose excluded keys are all absent wins
+TOOL_INPUT_RULES = (
+    (frozenset({'file_path', 'offset'}), frozenset(), 'Read'),
+    (frozenset({'file_path', 'content'}), frozenset(), 'Write'),
+    (frozenset({'file_path', 'old_string'}), frozenset(), 'Edit'),
+    (frozenset({'command', 'description'}), frozenset(), 'Bash'),
+    (frozenset({'pattern', 'glob'}), frozenset(), 'Grep'),
+    (frozenset({'pattern'}), frozenset({'path'}), 'Glob'),
+    (frozenset({'subagent_type'}), frozenset(), 'Task'),
+    (frozenset({'description', 'prompt'}), frozenset(), 'Task'),
+    (frozenset({'url', 'prompt'}), frozenset(), 'WebFetch'),
+    (frozenset({'query', 'allowed_domains'}), frozenset(), 'WebSearch'),
+)
+
+EVENT_TYPE_TOOL_NAMES = {
+    'SessionStart': 'SessionStart',
+    'Stop': 'SessionEnd',
+    'SubagentStop': 'SubagentComplete',
+    'PreToolUse': 'ToolExecution',
+    'PostToolUse': 'ToolComplete',
+}
+
+
+@lru_cache(maxsize=512)
+def infer_tool_from_input_keys(keys: frozenset) -> Optional[str]:
+    """Apply TOOL_INPUT_RULES to a tool_input key set; memoized per key set."""
+    for required, excluded, tool_name in TOOL_INPUT_RULES:
+        if required <= keys and excluded.isdisjoint(keys):
+            return tool_name
+    return None
+
+
 def extract_tool_name(input_data: dict, event_type: str) -> str:
     """
     Extract tool name from input data with multiple fallback strategies.
@@ -69,42 +105,13 @@ def extract_tool_name(input_data: dict, event_type: str) -> str:
     # Strategy 3: Infer from tool_input structure
     tool_input = input_data.get('tool_input', {})
     if isinstance(tool_input, dict):
-        # Read operations
-        if 'file_path' in tool_input and 'offset' in tool_input:
-            return 'Read'
-        # Write operations
-        elif 'file_path' in tool_input and 'content' in tool_input:
-            return 'Write'
-        # Edit operations
-        elif 'file_path' in tool_input and 'old_string' in tool_input:
-            return 'Edit'
-        # Bash commands
-        elif 'command' in tool_input and 'description' in tool_input:
-            return 'Bash'
-        # Search operations
-        elif 'pattern' in tool_input and 'glob' in tool_input:
-            return 'Grep'
-        elif 'pattern' in tool_input and 'path' not in tool_input:
-            return 'Glob'
-        # Task delegation
-        elif 'subagent_type' in tool_input or 'description' in tool_input and 'prompt' in tool_input:
-            return 'Task'
-        # Web operations
-        elif 'url' in tool_input and 'prompt' in tool_input:
-            return 'WebFetch'
-        elif 'query' in tool_input and 'allowed_domains' in tool_input:
-            return 'WebSearch'
+        tool_name = infer_tool_from_input_keys(frozenset(tool_input))
+        if tool_name:
+            return tool_name
 
     # Strategy 4: Infer from event_type
-    event_type_mapping = {
-        'SessionStart': 'SessionStart',
-        'Stop': 'SessionEnd',
-        'SubagentStop': 'SubagentComplete',
-        'PreToolUse': 'ToolExecution',
-        'PostToolUse': 'ToolComplete',
-    }
-    if event_type in event_type_mapping:
-        return event_type_mapping[event_type]
+    if event_type in EVENT_TYPE_TOOL_NAMES:
+        return EVENT_TYPE_TOOL_NAMES[event_type]
 
     # Strategy 5: Check payload for tool information
     payload = input_data.get('payload', {})
@@ -28,6 +28,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'utils'))
 from session_helpers import get_project_name, get_project_status, get_git_status, store_session_id
 from constants import ensure_session_log_dir
 from http_client import send_event_to_server
+from hook_server import get_serve_path, serve
 
 
 def create_session_event(session_id: str, source: str, project_name: str) -> dict:
@@ -45,11 +46,9 @@ def create_session_event(session_id: str, source: str, project_name: str) -> dic
     }
 
 
-def main():
-    """Main event tracker execution - single focused purpose."""
+def handle(input_data: dict) -> int:
+    """Track one session event from parsed hook input; returns the exit code."""
     try:
-        # Read input data from stdin
-        input_data = json.loads(sys.stdin.read())
         session_id = input_data.get('session_id', 'unknown')
         source = input_data.get('source', 'startup')
         
@@ -72,6 +71,24 @@ def main():
         print(f"Event tracker error: {e}", file=sys.stderr)
         # Don't exit with error - event tracking failure shouldn't break session start
 
+    return 0
+
+
+def main():
+    """Main event tracker execution - single focused purpose."""
+    try:
+        # Read input data from stdin
+        input_data = json.loads(sys.stdin.read())
+    except Exception as e:
+        print(f"Event tracker error: {e}", file=sys.stderr)
+        return
+
+    handle(input_data)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    serve_path = get_serve_path()
+    if serve_path:
+        serve(main, serve_path)
+    else:
+        main()
\ No newline at end of file
@@ -74,6 +74,9 @@ import yaml
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+# This file lives at <project>/.claude/hooks/utils/
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
 
 def find_agent_file(agent_name: str) -> Optional[Path]:
     """Find agent definition file in .claude/agents/ directory."""
@@ -89,8 +92,7 @@ def find_agent_file(agent_name: str) -> Optional[Path]:
         current_dir = current_dir.parent
     
     # Also check relative to this script's location
-    script_dir = Path(__file__).parent.parent.parent
-    agents_dir = script_dir / ".claude" / "agents"
+    agents_dir = PROJECT_ROOT / ".claude" / "agents"
     agent_file = agents_dir / f"{agent_name}.md"
     if agent_file.exists():
         return agent_file
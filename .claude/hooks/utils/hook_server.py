@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Hook Worker Server
+
+Lets a hook script stay resident and handle many invocations over a Unix
+domain socket instead of paying interpreter startup for each one. Used by
+the integration test harnesses; Claude Code itself still runs hooks as
+one-shot processes.
+
+Protocol (newline-delimited JSON, one exchange per line):
+    request:  the exact JSON the hook would normally read from stdin
+    response: {"stdout": str, "stderr": str, "returncode": int}
+"""
+
+import io
+import json
+import os
+import socket
+import sys
+from typing import Callable, Optional
+
+
+SERVE_FLAG = "--serve"
+
+
+def get_serve_path(argv: Optional[list] = None) -> Optional[str]:
+    """Return the socket path following --serve, or None when not serving."""
+    argv = sys.argv if argv is None else argv
+    if SERVE_FLAG in argv:
+        index = argv.index(SERVE_FLAG)
+        if index + 1 < len(argv):
+            return argv[index + 1]
+    return None
+
+
+def run_once(main: Callable[[], None], stdin_data: str) -> dict:
+    """Run a hook's main() against stdin_data with captured stdio."""
+    saved = sys.stdin, sys.stdout, sys.stderr
+    stdout, stderr = io.StringIO(), io.StringIO()
+    sys.stdin, sys.stdout, sys.stderr = io.StringIO(stdin_data), stdout, stderr
+
+    returncode = 0
+    try:
+        main()
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            returncode = e.code
+        elif e.code is not None:
+            print(e.code, file=stderr)
+            returncode = 1
+    except Exception as e:
+        print(f"Unhandled hook error: {e}", file=stderr)
+        returncode = 1
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = saved
+
+    return {
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "returncode": returncode
+    }
+
+
+def serve(main: Callable[[], None], socket_path: str) -> None:
+    """Serve hook invocations on socket_path until the process is terminated."""
+    try:
+        os.unlink(socket_path)
+    except FileNotFoundError:
+        pass
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn, conn.makefile('rb') as reader:
+                for line in reader:
+                    result = run_once(main, line.decode('utf-8'))
+                    conn.sendall(json.dumps(result).encode('utf-8') + b"\n")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        try:
+            os.unlink(socket_path)
+        except FileNotFoundError:
+            pass
@@ -154,7 +154,7 @@ def store_session_id(session_id: str, project_name: str) -> bool:
         # Create temporary file in same directory for atomic operation
         with tempfile.NamedTemporaryFile(
             mode='w',
-            dir='/tmp',
+            dir=session_file.parent,
             prefix=f'claude_session_{project_name}_',
             suffix='.tmp',
             delete=False
@@ -4,16 +4,26 @@ Message deduplication and rate limiting for TTS notifications.
 Prevents redundant announcements within configurable time windows.
 """
 
+import atexit
 import hashlib
 import json
+import os
+import tempfile
 import time
 from pathlib import Path
-from typing import Optional, Dict, Any
-from dataclasses import dataclass, asdict
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Tuple
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+
+@dataclass(slots=True)
 class MessageRecord:
     """Record of a spoken message for deduplication."""
     message_hash: str
@@ -24,6 +34,47 @@ class MessageRecord:
     last_spoken: float = 0.0
 
 
+# Reserved cache key for category token buckets (record keys are 16-char hashes)
+_BUCKETS_KEY = "__category_buckets__"
+
+# Suppressed repeats are written lazily: once this many changes are pending
+# or this many seconds have passed since the last write
+FLUSH_MAX_PENDING = 32
+FLUSH_INTERVAL = 5.0
+
+# Categories inferred from summary text, checked in priority order: the
+# first category with a keyword present wins, otherwise "general"
+CATEGORY_KEYWORDS = (
+    (("session completed", "session ended"), "session_completion"),
+    (("started session", "session started"), "session_start"),
+    (("error", "failed"), "error"),
+    (("warning", "caution"), "warning"),
+    (("completed", "finished"), "completion"),
+)
+
+# Category-specific cooldowns (in seconds), shared read-only by all instances
+CATEGORY_COOLDOWNS = MappingProxyType({
+    "session_completion": 300,  # 5 minutes
+    "session_start": 300,       # 5 minutes
+    "error": 60,                # 1 minute (allow more frequent error notices)
+    "warning": 120,             # 2 minutes
+    "completion": 180,          # 3 minutes
+    "general": 300,             # 5 minutes
+})
+
+# Only this much of each message is kept; it is used for stats display only
+STATS_TEXT_LENGTH = 50
+
+_RECORD_FIELDS = ("message_hash", "message_text", "category", "timestamp", "count", "last_spoken")
+
+
+def _record_to_dict(record: MessageRecord) -> Dict[str, Any]:
+    """Serialize a MessageRecord field-by-field (json ``default`` hook)."""
+    if isinstance(record, MessageRecord):
+        return {name: getattr(record, name) for name in _RECORD_FIELDS}
+    raise TypeError(f"Object of type {type(record).__name__} is not JSON serializable")
+
+
 class MessageDeduplicator:
     """
     Deduplicates and rate-limits TTS messages.
@@ -33,13 +84,32 @@ class MessageDeduplicator:
     - Category-based rate limiting (max messages per category per time window)
     - Similarity detection (fuzzy matching for similar messages)
     - Persistent storage (survives process restarts)
+
+    Spoken messages are written to the cache immediately so other processes
+    see them; suppression bookkeeping is batched, so long-lived callers
+    should call flush() before exiting (the global instance does this
+    automatically).
     """
 
+    __slots__ = (
+        "cache_file",
+        "default_cooldown",
+        "cleanup_after",
+        "persist",
+        "records",
+        "category_cooldowns",
+        "category_rate_limits",
+        "_buckets",
+        "_pending",
+        "_last_flush",
+    )
+
     def __init__(
         self,
         cache_file: Optional[Path] = None,
         default_cooldown: int = 300,  # 5 minutes default
-        cleanup_after: int = 3600  # Clean up records older than 1 hour
+        cleanup_after: int = 3600,  # Clean up records older than 1 hour
+        persist: bool = True
     ):
         """
         Initialize the deduplicator.
@@ -48,31 +118,49 @@ class MessageDeduplicator:
             cache_file: Path to persistent cache file
             default_cooldown: Default cooldown period in seconds
             cleanup_after: Remove records older than this (seconds)
+            persist: Load and save the cache file; False keeps state in memory only
         """
         self.cache_file = cache_file or Path("/tmp/tts-queue/message-cache.json")
         self.default_cooldown = default_cooldown
         self.cleanup_after = cleanup_after
+        self.persist = persist
         self.records: Dict[str, MessageRecord] = {}
 
-        # Category-specific cooldowns (in seconds)
-        self.category_cooldowns = {
-            "session_completion": 300,  # 5 minutes
-            "session_start": 300,       # 5 minutes
-            "error": 60,                # 1 minute (allow more frequent error notices)
-            "warning": 120,             # 2 minutes
-            "completion": 180,          # 3 minutes
-            "general": 300,             # 5 minutes
+        self.category_cooldowns = CATEGORY_COOLDOWNS
+
+        # Category token buckets: (capacity, period in seconds). Each category
+        # may announce a burst of `capacity` distinct messages, refilling at
+        # capacity/period tokens per second.
+        self.category_rate_limits: Dict[str, Tuple[int, float]] = {
+            "session_completion": (3, 300),
+            "session_start": (3, 300),
+            "error": (5, 60),
+            "warning": (5, 120),
+            "completion": (5, 180),
+            "general": (10, 300),
         }
+        # category -> (tokens, last_refill)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+        # Unsaved changes since the last cache write
+        self._pending = 0
+        self._last_flush = time.monotonic()
 
         # Load existing records
-        self._load_cache()
+        if persist:
+            self._load_cache()
 
     def _load_cache(self):
         """Load message records from cache file."""
         try:
             if self.cache_file.exists():
-                with open(self.cache_file, 'r') as f:
-                    data = json.load(f)
+                with open(self.cache_file, 'rb') as f:
+                    raw = f.read()
+                    data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+                    self._buckets = {
+                        k: tuple(v)
+                        for k, v in data.pop(_BUCKETS_KEY, {}).items()
+                    }
                     self.records = {
                         k: MessageRecord(**v)
                         for k, v in data.items()
@@ -80,20 +168,59 @@ class MessageDeduplicator:
         except Exception:
             # If cache is corrupt, start fresh
             self.records = {}
+            self._buckets = {}
 
     def _save_cache(self):
         """Save message records to cache file."""
+        if not self.persist:
+            self._pending = 0
+            return
         try:
             self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.cache_file, 'w') as f:
-                json.dump(
-                    {k: asdict(v) for k, v in self.records.items()},
-                    f,
-                    indent=2
-                )
+            # Records are encoded in place (orjson handles slotted dataclasses
+            # natively) rather than copied through asdict() first. The cache is
+            # machine-read only, so it is written compactly.
+            data = {**self.records, _BUCKETS_KEY: self._buckets}
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(data)
+            else:
+                payload = json.dumps(
+                    data, default=_record_to_dict, separators=(',', ':')
+                ).encode()
+            # Write beside the cache and rename over it, so a concurrent
+            # reader never sees a partially written file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_file.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
         except Exception:
             # Silently fail - caching is non-critical
             pass
+        finally:
+            self._pending = 0
+            self._last_flush = time.monotonic()
+
+    def _mark_dirty(self):
+        """Record an unsaved change, writing the cache once enough accumulate."""
+        self._pending += 1
+        if (self._pending >= FLUSH_MAX_PENDING
+                or time.monotonic() - self._last_flush >= FLUSH_INTERVAL):
+            self._save_cache()
+
+    def flush(self):
+        """Write any unsaved changes to the cache file."""
+        if self._pending:
+            self._save_cache()
+
+    def reset(self):
+        """Forget all records and bucket state, and clear the cache file."""
+        self.records.clear()
+        self._buckets.clear()
+        self._save_cache()
 
     def _cleanup_old_records(self):
         """Remove records older than cleanup_after threshold."""
@@ -111,16 +238,38 @@ class MessageDeduplicator:
 
         # Save if we cleaned anything up
         if old_keys:
-            self._save_cache()
+            self._mark_dirty()
+
+    def _take_category_token(self, category: str, now: float) -> bool:
+        """
+        Consume one token from the category's bucket.
+
+        Returns:
+            True if a token was available, False if the category is rate-limited
+        """
+        limit = self.category_rate_limits.get(category)
+        if limit is None:
+            return True
+
+        capacity, period = limit
+        tokens, last_refill = self._buckets.get(category, (capacity, now))
+        tokens = min(capacity, tokens + (now - last_refill) * capacity / period)
+
+        if tokens < 1:
+            self._buckets[category] = (tokens, now)
+            return False
+
+        self._buckets[category] = (tokens - 1, now)
+        return True
 
     def _create_message_hash(self, message: str, category: str) -> str:
         """Create a hash for message deduplication."""
         # Normalize message for comparison
         normalized = message.lower().strip()
 
-        # Create hash from normalized message + category
+        # Create a 16-hex-char key from normalized message + category
         hash_input = f"{category}:{normalized}"
-        return hashlib.md5(hash_input.encode()).hexdigest()[:16]
+        return hashlib.blake2b(hash_input.encode(), digest_size=8).hexdigest()
 
     def _extract_category(self, context: Dict[str, Any]) -> str:
         """Extract message category from context."""
@@ -131,18 +280,10 @@ class MessageDeduplicator:
         # Infer from message content
         message = context.get("summary", "").lower()
 
-        if "session completed" in message or "session ended" in message:
-            return "session_completion"
-        elif "started session" in message or "session started" in message:
-            return "session_start"
-        elif "error" in message or "failed" in message:
-            return "error"
-        elif "warning" in message or "caution" in message:
-            return "warning"
-        elif "completed" in message or "finished" in message:
-            return "completion"
-        else:
-            return "general"
+        for keywords, category in CATEGORY_KEYWORDS:
+            if any(keyword in message for keyword in keywords):
+                return category
+        return "general"
 
     def should_speak(
         self,
@@ -180,18 +321,25 @@ class MessageDeduplicator:
             if time_since_last < cooldown:
                 # Still in cooldown period
                 record.count += 1
-                self._save_cache()
+                self._mark_dirty()
 
                 time_remaining = int(cooldown - time_since_last)
                 reason = f"Message in cooldown (category: {category}, {time_remaining}s remaining, repeated {record.count}x)"
                 return False, reason
 
+        # Check the category's token bucket
+        current_time = time.time()
+        if not self._take_category_token(category, current_time):
+            self._mark_dirty()
+            capacity, period = self.category_rate_limits[category]
+            reason = f"Category rate limit reached (category: {category}, max {capacity} per {int(period)}s)"
+            return False, reason
+
         # Message should be spoken
         # Update or create record
-        current_time = time.time()
         self.records[msg_hash] = MessageRecord(
             message_hash=msg_hash,
-            message_text=message,
+            message_text=message[:STATS_TEXT_LENGTH],
             category=category,
             timestamp=current_time,
             last_spoken=current_time,
@@ -228,7 +376,7 @@ class MessageDeduplicator:
         for record in self.records.values():
             if record.timestamp > recent_threshold and record.count > 1:
                 stats["recent_duplicates"].append({
-                    "message": record.message_text[:50],
+                    "message": record.message_text[:STATS_TEXT_LENGTH],
                     "category": record.category,
                     "count": record.count,
                     "last_spoken": datetime.fromtimestamp(record.last_spoken).isoformat()
@@ -246,6 +394,7 @@ def get_deduplicator() -> MessageDeduplicator:
     global _deduplicator
     if _deduplicator is None:
         _deduplicator = MessageDeduplicator()
+        atexit.register(_deduplicator.flush)
     return _deduplicator
 
 
@@ -1,16 +1,18 @@
-#!/usr/bin/env uv run --quiet --with requests
+#!/usr/bin/env uv run --quiet --with orjson
 """
 MCP Error Handling Evaluator
 Requirement 5: Graceful error responses with helpful feedback
 """
 
-import json
 import sys
 import os
 import re
-from pathlib import Path
 from datetime import datetime
 
+from utils.mcp_scan import ScanCache, iter_source_files, open_source
+from utils.mcp_json import dumps
+from utils.mcp_observability import send_evaluation
+
 def evaluate_error_handling(project_path):
     """Evaluate error handling implementation"""
     results = {
@@ -27,26 +29,37 @@ def evaluate_error_handling(project_path):
         "error_types": r"(Error|Exception)\s*\(",
         "logging": r"(console\.(error|warn)|logger\.(error|warning)|logging\.(error|warning))"
     }
+    # Byte patterns so they can run directly against memory-mapped files
+    compiled_patterns = {
+        name: re.compile(pattern.encode(), re.MULTILINE)
+        for name, pattern in error_handling_patterns.items()
+    }
     
     patterns_found = {}
     files_checked = 0
     
     # Scan source files
-    extensions = ["*.py", "*.js", "*.ts", "*.mjs"]
-    for ext in extensions:
-        for file_path in Path(project_path).rglob(ext):
-            files_checked += 1
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                    for pattern_name, pattern in error_handling_patterns.items():
-                        if re.search(pattern, content, re.MULTILINE):
-                            if pattern_name not in patterns_found:
-                                patterns_found[pattern_name] = 0
-                            patterns_found[pattern_name] += 1
-            except:
-                continue
+    scan_cache = ScanCache("error-handling", project_path, list(error_handling_patterns.values()))
+    for file_path in iter_source_files(project_path):
+        files_checked += 1
+        try:
+            st = os.stat(file_path)
+            matched = scan_cache.get(file_path, st)
+            if matched is None:
+                with open_source(file_path) as content:
+                    matched = [
+                        pattern_name for pattern_name, pattern in compiled_patterns.items()
+                        if pattern.search(content)
+                    ]
+                scan_cache.put(file_path, st, matched)
+            
+            for pattern_name in matched:
+                if pattern_name not in patterns_found:
+                    patterns_found[pattern_name] = 0
+                patterns_found[pattern_name] += 1
+        except:
+            continue
+    scan_cache.save()
     
     # Evaluate findings
     if files_checked == 0:
@@ -80,23 +93,21 @@ def evaluate_error_handling(project_path):
     
     return results
 
+def run(project_path=None):
+    """Entry point for in-process runners; returns the results dict"""
+    return evaluate_error_handling(project_path or os.getcwd())
+
 def main():
     project_path = os.getcwd()
-    results = evaluate_error_handling(project_path)
+    results = run(project_path)
     
     # Output results
-    print(json.dumps(results, indent=2))
+    print(dumps(results, indent=True))
     
-    # Send to observability system if available
-    try:
-        import requests
-        requests.post(
-            "http://localhost:3456/api/mcp-evaluation",
-            json=results,
-            timeout=1
-        )
-    except:
-        pass
+    # Close stdout first so a parent reading our output gets EOF without
+    # waiting on the POST; the response is never awaited
+    sys.stdout.close()
+    send_evaluation(results)
 
 if __name__ == "__main__":
     main()
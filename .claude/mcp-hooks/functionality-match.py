@@ -1,4 +1,4 @@
-#!/usr/bin/env uv run --quiet --with requests --with pyyaml
+#!/usr/bin/env uv run --quiet --with pyyaml --with orjson
 """
 MCP Functionality Match Evaluator
 Requirement 1: Verify implementation does exactly what it claims
@@ -12,6 +12,10 @@ import subprocess
 from pathlib import Path
 from datetime import datetime
 
+from utils.mcp_scan import walk_names
+from utils.mcp_json import dumps
+from utils.mcp_observability import send_evaluation
+
 def load_mcp_config(project_path):
     """Load MCP server configuration from project"""
     config_paths = [
@@ -50,12 +54,16 @@ def evaluate_functionality(project_path):
         tools = config.get("tools", [])
         results["evidence"].append(f"Found {len(tools)} defined tools in configuration")
         
+        # Walk the project once; every tool is matched against the same
+        # file and directory names
+        entry_names = list(walk_names(project_path)) if tools else []
+        
         # Check if each tool has implementation
         for tool in tools:
             tool_name = tool.get("name", "unknown")
             # Try to find corresponding implementation
-            impl_files = list(Path(project_path).rglob(f"*{tool_name}*"))
-            if impl_files:
+            has_impl = any(tool_name in name for name in entry_names)
+            if has_impl:
                 results["evidence"].append(f"Implementation found for tool '{tool_name}'")
             else:
                 results["evidence"].append(f"Warning: No implementation found for tool '{tool_name}'")
@@ -67,23 +75,21 @@ def evaluate_functionality(project_path):
     
     return results
 
+def run(project_path=None):
+    """Entry point for in-process runners; returns the results dict"""
+    return evaluate_functionality(project_path or os.getcwd())
+
 def main():
     project_path = os.getcwd()
-    results = evaluate_functionality(project_path)
+    results = run(project_path)
     
     # Output results
-    print(json.dumps(results, indent=2))
+    print(dumps(results, indent=True))
     
-    # Send to observability system if available
-    try:
-        import requests
-        requests.post(
-            "http://localhost:3456/api/mcp-evaluation",
-            json=results,
-            timeout=1
-        )
-    except:
-        pass
+    # Close stdout first so a parent reading our output gets EOF without
+    # waiting on the POST; the response is never awaited
+    sys.stdout.close()
+    send_evaluation(results)
 
 if __name__ == "__main__":
     main()
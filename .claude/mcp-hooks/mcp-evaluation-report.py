@@ -1,31 +1,70 @@
-#!/usr/bin/env uv run --quiet --with tabulate --with requests
+#!/usr/bin/env uv run --quiet --with tabulate --with pyyaml --with orjson
 """
 MCP Evaluation Report Generator
 Generates comprehensive evaluation report based on all test results
 """
 
-import json
-import sys
 import os
+import importlib.util
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 from tabulate import tabulate
 
+from utils.mcp_observability import send_evaluation_batch
+
+HOOKS_DIR = Path(__file__).parent
+
+# Evaluator hooks in report order; each exposes run(project_path) -> dict
+EVALUATORS = [
+    "functionality-match.py",
+    "prompt-injection.py",
+    "tool-naming.py",
+    "working-examples.py",
+    "error-handling.py",
+]
+
+def load_evaluator(filename):
+    """Import an evaluator hook by file path (hook names contain dashes)"""
+    module_name = filename.replace(".py", "").replace("-", "_")
+    spec = importlib.util.spec_from_file_location(module_name, HOOKS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.run
+
+def run_evaluators(project_path):
+    """Run all evaluators in-process and collect their results"""
+    results = []
+    for filename in EVALUATORS:
+        try:
+            evaluate = load_evaluator(filename)
+            results.append(evaluate(project_path))
+        except Exception:
+            results.append({
+                "requirement": filename.replace(".py", ""),
+                "score": "Error",
+                "evidence": ["Test execution failed"]
+            })
+    
+    score_counts = Counter(r.get("score") for r in results)
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "project": str(project_path),
+        "results": results,
+        "summary": {
+            "passed": score_counts["Pass"],
+            "failed": score_counts["Fail"],
+            "need_info": score_counts["Need More Info"]
+        }
+    }
+
 def generate_report():
     """Generate comprehensive evaluation report"""
-    # Run the test runner to get all results
-    import subprocess
-    result = subprocess.run(
-        [sys.executable, ".claude/hooks/utils/mcp_test_runner.py"],
-        capture_output=True,
-        text=True
-    )
+    # Evaluate in-process rather than paying for a test-runner interpreter
+    data = run_evaluators(os.getcwd())
     
-    try:
-        data = json.loads(result.stdout)
-    except:
-        print("Error: Could not run tests")
-        return
+    # One request for every evaluator result instead of one per evaluator
+    send_evaluation_batch(data['results'])
     
     # Create formatted report
     print("\n" + "="*60)
@@ -1,15 +1,17 @@
-#!/usr/bin/env uv run --quiet --with requests
+#!/usr/bin/env uv run --quiet --with orjson
 """
 MCP Prompt Injection Tester
 Requirement 2: No unexpected messages or prompts to publish to social media
 """
 
-import json
 import sys
 import os
 import re
 from datetime import datetime
-from pathlib import Path
+
+from utils.mcp_scan import ScanCache, iter_source_files, open_source
+from utils.mcp_json import dumps
+from utils.mcp_observability import send_evaluation
 
 # Common prompt injection patterns
 INJECTION_PATTERNS = [
@@ -28,6 +30,12 @@ INJECTION_PATTERNS = [
     r"###\s*Assistant:",
 ]
 
+# Byte patterns so they can run directly against memory-mapped files
+COMPILED_INJECTION_PATTERNS = [
+    (pattern, re.compile(pattern.encode(), re.IGNORECASE))
+    for pattern in INJECTION_PATTERNS
+]
+
 def scan_for_injections(project_path):
     """Scan project files for prompt injection attempts"""
     results = {
@@ -38,24 +46,30 @@ def scan_for_injections(project_path):
     }
     
     # Scan all Python and JavaScript files
-    extensions = ["*.py", "*.js", "*.ts", "*.mjs"]
     suspicious_files = []
     
-    for ext in extensions:
-        for file_path in Path(project_path).rglob(ext):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                    for pattern in INJECTION_PATTERNS:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            suspicious_files.append({
-                                "file": str(file_path.relative_to(project_path)),
-                                "pattern": pattern
-                            })
-                            results["score"] = "Fail"
-            except:
-                continue
+    scan_cache = ScanCache("prompt-injection", project_path, INJECTION_PATTERNS)
+    for file_path in iter_source_files(project_path):
+        try:
+            st = os.stat(file_path)
+            matched = scan_cache.get(file_path, st)
+            if matched is None:
+                with open_source(file_path) as content:
+                    matched = [
+                        pattern for pattern, compiled in COMPILED_INJECTION_PATTERNS
+                        if compiled.search(content)
+                    ]
+                scan_cache.put(file_path, st, matched)
+            
+            for pattern in matched:
+                suspicious_files.append({
+                    "file": os.path.relpath(file_path, project_path),
+                    "pattern": pattern
+                })
+                results["score"] = "Fail"
+        except:
+            continue
+    scan_cache.save()
     
     if suspicious_files:
         results["evidence"].append(f"Found {len(suspicious_files)} suspicious patterns")
@@ -67,23 +81,21 @@ def scan_for_injections(project_path):
     
     return results
 
+def run(project_path=None):
+    """Entry point for in-process runners; returns the results dict"""
+    return scan_for_injections(project_path or os.getcwd())
+
 def main():
     project_path = os.getcwd()
-    results = scan_for_injections(project_path)
+    results = run(project_path)
     
     # Output results
-    print(json.dumps(results, indent=2))
+    print(dumps(results, indent=True))
     
-    # Send to observability system if available
-    try:
-        import requests
-        requests.post(
-            "http://localhost:3456/api/mcp-evaluation",
-            json=results,
-            timeout=1
-        )
-    except:
-        pass
+    # Close stdout first so a parent reading our output gets EOF without
+    # waiting on the POST; the response is never awaited
+    sys.stdout.close()
+    send_evaluation(results)
 
 if __name__ == "__main__":
     main()
@@ -1,4 +1,4 @@
-#!/usr/bin/env uv run --quiet --with requests
+#!/usr/bin/env uv run --quiet --with orjson
 """
 MCP Tool Naming Validator
 Requirement 3: Unique, non-conflicting names that clearly indicate function
@@ -10,6 +10,9 @@ import os
 from pathlib import Path
 from datetime import datetime
 
+from utils.mcp_json import dumps
+from utils.mcp_observability import send_evaluation
+
 def evaluate_tool_names(project_path):
     """Evaluate tool naming conventions"""
     results = {
@@ -66,23 +69,21 @@ def evaluate_tool_names(project_path):
     
     return results
 
+def run(project_path=None):
+    """Entry point for in-process runners; returns the results dict"""
+    return evaluate_tool_names(project_path or os.getcwd())
+
 def main():
     project_path = os.getcwd()
-    results = evaluate_tool_names(project_path)
+    results = run(project_path)
     
     # Output results
-    print(json.dumps(results, indent=2))
+    print(dumps(results, indent=True))
     
-    # Send to observability system if available
-    try:
-        import requests
-        requests.post(
-            "http://localhost:3456/api/mcp-evaluation",
-            json=results,
-            timeout=1
-        )
-    except:
-        pass
+    # Close stdout first so a parent reading our output gets EOF without
+    # waiting on the POST; the response is never awaited
+    sys.stdout.close()
+    send_evaluation(results)
 
 if __name__ == "__main__":
     main()
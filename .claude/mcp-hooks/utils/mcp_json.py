@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+MCP JSON - orjson-backed encoding for evaluation payloads, stdlib json fallback
+"""
+
+import json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def dumps_bytes(obj):
+    """Encode obj as compact UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+def dumps(obj, indent=False):
+    """Encode obj as a JSON string, two-space indented when indent is set"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+def loads(data):
+    """Decode JSON from str or bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+MCP Observability - Fire-and-forget delivery of evaluation results
+"""
+
+import http.client
+
+from utils.mcp_json import dumps_bytes
+
+OBSERVABILITY_HOST = "localhost"
+OBSERVABILITY_PORT = 3456
+EVALUATION_ENDPOINT = "/api/mcp-evaluation"
+EVALUATION_BATCH_ENDPOINT = "/api/mcp-evaluation/batch"
+
+def send_evaluation(results, endpoint=EVALUATION_ENDPOINT, timeout=1):
+    """POST results to the observability server without waiting for a response.
+
+    The request is written to the socket and the connection closed; the
+    server's reply is never read, so a slow server cannot hold up the hook.
+    """
+    body = dumps_bytes(results)
+    conn = http.client.HTTPConnection(OBSERVABILITY_HOST, OBSERVABILITY_PORT, timeout=timeout)
+    try:
+        conn.request("POST", endpoint, body=body, headers={"Content-Type": "application/json"})
+    except (OSError, http.client.HTTPException):
+        pass
+    finally:
+        conn.close()
+
+def send_evaluation_batch(results, timeout=2):
+    """POST a full set of evaluator results as one batch request"""
+    send_evaluation({"results": results}, endpoint=EVALUATION_BATCH_ENDPOINT, timeout=timeout)
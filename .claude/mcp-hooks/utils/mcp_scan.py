@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+MCP Scan Utilities - Shared source-file access for the MCP evaluation hooks
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from utils.mcp_json import dumps_bytes, loads
+
+# Below this size mmap setup costs more than a plain read
+MMAP_MIN_SIZE = 4096
+
+# Dependency, VCS and build directories never worth scanning
+IGNORED_DIRS = {
+    ".git", ".venv", "venv", "node_modules", "__pycache__",
+    "dist", "build", ".mypy_cache"
+}
+
+SOURCE_EXTENSIONS = (".py", ".js", ".ts", ".mjs")
+
+# Per-file scan results shared by all scanners, kept out of the source tree
+# alongside the evaluators' result cache
+SCAN_CACHE_FILE = Path.home() / ".cache" / "mcp-eval" / "scan_cache.json"
+
+def walk_files(project_path):
+    """Yield every file path under project_path, pruning ignored directories"""
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+        for name in files:
+            yield os.path.join(root, name)
+
+def walk_names(project_path):
+    """Yield the name of every directory and file under project_path, pruning ignored directories"""
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+        yield from dirs
+        yield from files
+
+def iter_source_files(project_path, extensions=SOURCE_EXTENSIONS):
+    """Yield source file paths under project_path matching the given extensions"""
+    for file_path in walk_files(project_path):
+        if file_path.endswith(extensions):
+            yield file_path
+
+@contextmanager
+def open_source(file_path):
+    """Yield a bytes-like view of a source file, memory-mapped when large"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            yield f.read()
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+class ScanCache:
+    """Per-file scan results reused while a file's (mtime, size) is unchanged"""
+
+    def __init__(self, scanner, project_path, patterns, cache_file=SCAN_CACHE_FILE):
+        # One section per (scanner, project) so the shared cache file holds
+        # every project's results instead of only the last one scanned
+        self.section = f"{scanner}:{Path(project_path).resolve()}"
+        self.cache_file = Path(cache_file)
+        # Changing a scanner's patterns invalidates everything it cached
+        self.signature = hashlib.sha1("\n".join(patterns).encode()).hexdigest()
+        self.data = self._load()
+        section = self.data.get(self.section, {})
+        self.entries = section.get("files", {}) if section.get("signature") == self.signature else {}
+        self.seen = {}
+
+    def _load(self):
+        try:
+            with open(self.cache_file, 'rb') as f:
+                return loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, file_path, st):
+        """Return cached matches for file_path, or None if it must be rescanned"""
+        entry = self.entries.get(file_path)
+        if entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            self.seen[file_path] = entry
+            return entry["matches"]
+        return None
+
+    def put(self, file_path, st, matches):
+        self.seen[file_path] = {"mtime": st.st_mtime_ns, "size": st.st_size, "matches": matches}
+
+    def save(self):
+        """Persist entries seen this run; files no longer scanned drop out"""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Hold the lock across re-read and replace so sections written by
+            # scanners saving concurrently survive
+            with open(self.cache_file.with_suffix(".lock"), 'a') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                self.data = self._load()
+                self.data[self.section] = {"signature": self.signature, "files": self.seen}
+                fd, tmp_file = tempfile.mkstemp(dir=self.cache_file.parent, suffix=".tmp")
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(dumps_bytes(self.data))
+                os.replace(tmp_file, self.cache_file)
+        except OSError:
+            pass
@@ -4,16 +4,29 @@ MCP Test Runner - Automated testing framework for MCP servers
 """
 
 import subprocess
-import json
+import importlib.util
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+# Make utils.* importable when run directly as .claude/hooks/utils/mcp_test_runner.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.mcp_json import dumps, loads
+
 class MCPTestRunner:
     def __init__(self, project_path):
         self.project_path = Path(project_path)
         self.results = []
         
+        self.hooks_dir = self.project_path / ".claude" / "hooks"
+        
+        # Tests are imported in-process, so their utils.* imports must resolve
+        if str(self.hooks_dir) not in sys.path:
+            sys.path.insert(0, str(self.hooks_dir))
+        
     def run_all_tests(self):
         """Run all MCP evaluation tests"""
         tests = [
@@ -24,38 +37,73 @@ class MCPTestRunner:
             "error-handling.py"
         ]
         
-        for test in tests:
-            test_path = self.project_path / ".claude" / "hooks" / test
-            if test_path.exists():
-                result = subprocess.run(
-                    [sys.executable, str(test_path)],
-                    capture_output=True,
-                    text=True,
-                    cwd=self.project_path
-                )
-                
-                try:
-                    test_result = json.loads(result.stdout)
-                    self.results.append(test_result)
-                except:
-                    self.results.append({
-                        "requirement": test.replace(".py", ""),
-                        "score": "Error",
-                        "evidence": ["Test execution failed"]
-                    })
+        tests = [t for t in tests if (self.hooks_dir / t).exists()]
+        
+        # Tests are independent; map() keeps results in the original order
+        if tests:
+            with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+                self.results.extend(executor.map(self._run_one, tests))
         
         return self.results
     
+    def _run_one(self, test):
+        """Run a single evaluation test and return its parsed result"""
+        entry = self._load_entry(test)
+        if entry is None:
+            return self._run_subprocess(test)
+        
+        try:
+            return entry(str(self.project_path))
+        except:
+            return {
+                "requirement": test.replace(".py", ""),
+                "score": "Error",
+                "evidence": ["Test execution failed"]
+            }
+    
+    def _load_entry(self, test):
+        """Import a test by file path and return its run() entry point, if any"""
+        test_path = self.hooks_dir / test
+        module_name = test.replace(".py", "").replace("-", "_")
+        try:
+            spec = importlib.util.spec_from_file_location(module_name, test_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except Exception:
+            return None
+        return getattr(module, "run", None)
+    
+    def _run_subprocess(self, test):
+        """Fallback for tests without a run() entry point"""
+        test_path = self.hooks_dir / test
+        # stdout is read once as bytes and parsed without a text decode;
+        # stderr is never read, so it is discarded instead of captured
+        with subprocess.Popen(
+            [sys.executable, str(test_path)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.project_path
+        ) as process:
+            try:
+                return loads(process.stdout.read())
+            except:
+                return {
+                    "requirement": test.replace(".py", ""),
+                    "score": "Error",
+                    "evidence": ["Test execution failed"]
+                }
+    
     def generate_report(self):
         """Generate evaluation report"""
+        score_counts = Counter(r.get("score") for r in self.results)
         report = {
             "timestamp": datetime.now().isoformat(),
             "project": str(self.project_path),
             "results": self.results,
             "summary": {
-                "passed": sum(1 for r in self.results if r.get("score") == "Pass"),
-                "failed": sum(1 for r in self.results if r.get("score") == "Fail"),
-                "need_info": sum(1 for r in self.results if r.get("score") == "Need More Info")
+                "passed": score_counts["Pass"],
+                "failed": score_counts["Fail"],
+                "need_info": score_counts["Need More Info"]
             }
         }
         
@@ -65,4 +113,4 @@ if __name__ == "__main__":
     runner = MCPTestRunner(Path.cwd())
     runner.run_all_tests()
     report = runner.generate_report()
-    print(json.dumps(report, indent=2))
+    print(dumps(report, indent=True))
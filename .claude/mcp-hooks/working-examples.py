@@ -1,16 +1,46 @@
-#!/usr/bin/env uv run --quiet --with requests
+#!/usr/bin/env uv run --quiet --with orjson
 """
 MCP Working Examples Validator
 Requirement 4: At least 3 functional example prompts demonstrating core features
 """
 
-import json
 import sys
 import os
 import re
+import hashlib
+import subprocess
+import tempfile
+from fnmatch import translate
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
+from utils import mcp_scan
+from utils.mcp_scan import walk_files
+from utils.mcp_json import dumps, dumps_bytes, loads
+from utils.mcp_observability import send_evaluation
+
+# Requirement 4 threshold
+MIN_EXAMPLES = 3
+
+CODE_BLOCK_RE = re.compile(r'```(?:json|javascript|typescript|python)?\n(.*?)\n```', re.DOTALL)
+
+# Results memoized per project tree state (see cache_key)
+RESULT_CACHE_DIR = Path.home() / ".cache" / "mcp-eval"
+
+# Code this evaluator's results depend on; editing it invalidates cached results
+EVALUATOR_SOURCES = (Path(__file__), Path(mcp_scan.__file__))
+
+TEST_PATTERNS = ["test_*.py", "*.test.js", "*.spec.ts", "*.test.ts"]
+TEST_PATTERN_RES = [(pattern, re.compile(translate(pattern))) for pattern in TEST_PATTERNS]
+
+@lru_cache(maxsize=8)
+def read_text(path, mtime, size):
+    """Read a file once per (path, mtime, size); an edit changes the key"""
+    # Unbuffered, exactly-sized read: one read() call, no buffer regrowth
+    with open(path, 'rb', buffering=0) as f:
+        return f.read(size).decode('utf-8')
+
 def find_examples(project_path):
     """Find and validate examples in documentation"""
     results = {
@@ -20,21 +50,11 @@ def find_examples(project_path):
         "timestamp": datetime.now().isoformat()
     }
     
-    examples_found = []
+    # Only the number of examples matters for the score, not the examples
+    examples_found = 0
     
-    # Check README.md for examples
-    readme_path = Path(project_path) / "README.md"
-    if readme_path.exists():
-        with open(readme_path, 'r') as f:
-            content = f.read()
-            
-            # Look for code blocks with examples
-            code_blocks = re.findall(r'```(?:json|javascript|typescript|python)?\n(.*?)\n```', content, re.DOTALL)
-            examples_found.extend(code_blocks)
-            
-            # Look for example sections
-            if "## Example" in content or "### Example" in content:
-                results["evidence"].append("Found example section in README")
+    # Sources are checked cheapest first; the tree walk for test files only
+    # runs if the examples directory and README fall short of the threshold
     
     # Check for examples directory
     examples_dir = Path(project_path) / "examples"
@@ -42,46 +62,131 @@ def find_examples(project_path):
         example_files = list(examples_dir.glob("*"))
         if example_files:
             results["evidence"].append(f"Found {len(example_files)} files in examples directory")
-            examples_found.extend(example_files)
+            examples_found += len(example_files)
+    
+    # Check README.md for examples
+    readme_path = Path(project_path) / "README.md"
+    if readme_path.exists():
+        st = readme_path.stat()
+        content = read_text(str(readme_path), st.st_mtime_ns, st.st_size)
+        
+        # Count code blocks with examples, stopping once the threshold is met
+        for _ in CODE_BLOCK_RE.finditer(content):
+            examples_found += 1
+            if examples_found >= MIN_EXAMPLES:
+                break
+        
+        # Look for example sections
+        if "## Example" in content or "### Example" in content:
+            results["evidence"].append("Found example section in README")
     
     # Check for test files (often contain examples)
-    test_patterns = ["test_*.py", "*.test.js", "*.spec.ts", "*.test.ts"]
-    for pattern in test_patterns:
-        test_files = list(Path(project_path).rglob(pattern))
-        if test_files:
-            results["evidence"].append(f"Found {len(test_files)} test files with potential examples")
-            examples_found.extend(test_files)
+    if examples_found < MIN_EXAMPLES:
+        # One walk of the tree, bucketing each file under the patterns it matches
+        test_files_by_pattern = {pattern: [] for pattern in TEST_PATTERNS}
+        for file_path in walk_files(project_path):
+            name = os.path.basename(file_path)
+            for pattern, pattern_re in TEST_PATTERN_RES:
+                if pattern_re.match(name):
+                    test_files_by_pattern[pattern].append(file_path)
+        
+        for pattern in TEST_PATTERNS:
+            test_files = test_files_by_pattern[pattern]
+            if test_files:
+                results["evidence"].append(f"Found {len(test_files)} test files with potential examples")
+                examples_found += len(test_files)
     
     # Evaluate findings
-    if len(examples_found) >= 3:
+    if examples_found >= MIN_EXAMPLES:
         results["score"] = "Pass"
-        results["evidence"].append(f"Found at least {min(len(examples_found), 3)} working examples")
+        results["evidence"].append(f"Found at least {MIN_EXAMPLES} working examples")
         results["evidence"].append("Documentation includes example code blocks")
-    elif len(examples_found) > 0:
+    elif examples_found > 0:
         results["score"] = "Need More Info"
-        results["evidence"].append(f"Found {len(examples_found)} examples (need at least 3)")
+        results["evidence"].append(f"Found {examples_found} examples (need at least {MIN_EXAMPLES})")
     else:
         results["evidence"].append("No examples found in documentation or code")
     
     return results
 
+def cache_key(project_path):
+    """Key for the project's current tree state, or None outside a git repo.
+
+    HEAD alone misses uncommitted edits, so the diff against HEAD and the
+    contents of untracked files are folded into the key as well; a file
+    that is already dirty changes the key again on every further edit.
+    The evaluator's own source is hashed in too, so changing its logic
+    never returns results computed by an older version.
+    """
+    try:
+        head = subprocess.run(
+            ["git", "-C", project_path, "rev-parse", "HEAD"],
+            capture_output=True, check=True
+        ).stdout.strip()
+        diff = subprocess.run(
+            ["git", "-C", project_path, "diff", "HEAD", "--binary"],
+            capture_output=True, check=True
+        ).stdout
+        untracked = subprocess.run(
+            ["git", "-C", project_path, "ls-files", "--others", "--exclude-standard", "-z"],
+            capture_output=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    
+    digest = hashlib.sha1(os.path.abspath(project_path).encode() + b"\n" + head + b"\n" + diff)
+    for name in filter(None, untracked.split(b"\0")):
+        digest.update(b"\0" + name + b"\0")
+        try:
+            digest.update((Path(project_path) / os.fsdecode(name)).read_bytes())
+        except OSError:
+            pass
+    for source in EVALUATOR_SOURCES:
+        digest.update(b"\n" + source.read_bytes())
+    return digest.hexdigest()
+
+def cached_find_examples(project_path):
+    """find_examples, memoized on disk per (project_path, git state)"""
+    key = cache_key(project_path)
+    if key is None:
+        return find_examples(project_path)
+    
+    cache_file = RESULT_CACHE_DIR / f"{key}.json"
+    try:
+        with open(cache_file, 'rb') as f:
+            results = loads(f.read())
+        results["timestamp"] = datetime.now().isoformat()
+        return results
+    except (OSError, ValueError):
+        pass
+    
+    results = find_examples(project_path)
+    try:
+        RESULT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=RESULT_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(dumps_bytes(results))
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+    
+    return results
+
+def run(project_path=None):
+    """Entry point for in-process runners; returns the results dict"""
+    return cached_find_examples(project_path or os.getcwd())
+
 def main():
     project_path = os.getcwd()
-    results = find_examples(project_path)
+    results = run(project_path)
     
     # Output results
-    print(json.dumps(results, indent=2))
+    print(dumps(results, indent=True))
     
-    # Send to observability system if available
-    try:
-        import requests
-        requests.post(
-            "http://localhost:3456/api/mcp-evaluation",
-            json=results,
-            timeout=1
-        )
-    except:
-        pass
+    # Close stdout first so a parent reading our output gets EOF without
+    # waiting on the POST; the response is never awaited
+    sys.stdout.close()
+    send_evaluation(results)
 
 if __name__ == "__main__":
     main()
@@ -7,59 +7,73 @@ Tests multiple hook types to ensure consistency
 import subprocess
 import json
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Test multiple hook types to ensure consistency
 hook_types = ['PreCompact', 'Stop', 'SubagentStop']
 
-print('Testing multiple hook types with realistic data...')
-print()
+# send_event_async.py declares no script dependencies, so `uv run` would only
+# add environment resolution to every call; run it with this interpreter.
+# The absolute path plus close_fds=False below lets CPython use posix_spawn.
+HOOK_COMMAND = [sys.executable, '.claude/hooks/send_event_async.py']
+
+# Set TTS_ENABLED=false to prevent actual audio during testing.
+# Built once and shared read-only by every hook run.
+env = os.environ.copy()
+env['TTS_ENABLED'] = 'false'
 
-for hook_type in hook_types:
-    print(f'Testing {hook_type} hook:')
-    
-    # Create realistic test data for each hook type
+def build_test_data(hook_type):
+    """Create realistic test data for each hook type"""
     if hook_type == 'PreCompact':
-        test_data = {
+        return {
             'conversation': 'Fixed hook configuration inconsistency across all Claude Code hooks',
             'context': 'Updated settings.json to use async summarization'
         }
     elif hook_type == 'Stop': 
-        test_data = {
+        return {
             'session_summary': 'Successfully updated hook configuration to eliminate generic TTS messages',
             'duration': 300,
             'files_modified': 1
         }
     else:  # SubagentStop
-        test_data = {
+        return {
             'agent_name': 'hook-config-fixer',
             'task': 'Update hook configurations for consistent behavior',
             'result': 'All hooks now use async summarization'
         }
-    
+
+def run_hook(hook_type, test_data):
+    """Run one hook and return its status line"""
     try:
-        # Set TTS_ENABLED=false to prevent actual audio during testing
-        env = os.environ.copy()
-        env['TTS_ENABLED'] = 'false'
-        
-        result = subprocess.run([
-            'uv', 'run', '.claude/hooks/send_event_async.py',
+        result = subprocess.run(HOOK_COMMAND + [
             '--source-app', 'multi-agent-observability-system',
             '--event-type', hook_type,
             '--summarize'
         ], input=json.dumps(test_data), capture_output=True, text=True, 
-           timeout=10, env=env)
+           timeout=10, env=env, close_fds=False)
         
         if result.returncode == 0:
-            print(f'  ✅ {hook_type} hook working correctly')
+            return f'  ✅ {hook_type} hook working correctly'
         else:
-            print(f'  ⚠️ {hook_type} returned code {result.returncode}')
+            return f'  ⚠️ {hook_type} returned code {result.returncode}'
             
     except subprocess.TimeoutExpired:
-        print(f'  ⏰ {hook_type} processing (timeout is normal)')
+        return f'  ⏰ {hook_type} processing (timeout is normal)'
     except Exception as e:
-        print(f'  ❌ {hook_type} error: {e}')
-    
-    print()
+        return f'  ❌ {hook_type} error: {e}'
+
+print('Testing multiple hook types with realistic data...')
+print()
+
+# The hooks are independent, so run them all at once and report as each finishes
+jobs = [(hook_type, build_test_data(hook_type)) for hook_type in hook_types]
+with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+    futures = {executor.submit(run_hook, hook_type, test_data): hook_type for hook_type, test_data in jobs}
+    for future in as_completed(futures):
+        print(f'Testing {futures[future]} hook:')
+        print(future.result())
+        print()
 
 print('🎉 Integration test complete!')
-print('All hooks should now provide contextual TTS instead of generic messages.')
\ No newline at end of file
+print('All hooks should now provide contextual TTS instead of generic messages.')
@@ -7,6 +7,7 @@ Tests session_context_loader.py with realistic data
 import json
 import subprocess
 import os
+import sys
 
 # Set environment
 os.environ['CLAUDE_PARENT_SESSION_ID'] = 'parent-789'
@@ -18,17 +19,21 @@ test_data = {
 }
 
 # Run session_context_loader
+# An absolute interpreter path and close_fds=False let CPython launch the
+# child with posix_spawn instead of fork+exec (Python's own fds are already
+# non-inheritable, so nothing extra leaks into the child)
 process = subprocess.Popen(
-    ['python3', '.claude/hooks/session_context_loader.py'],
+    [sys.executable, '.claude/hooks/session_context_loader.py'],
     stdin=subprocess.PIPE,
     stdout=subprocess.PIPE,
     stderr=subprocess.PIPE,
-    text=True
+    close_fds=False
 )
 
-stdout, stderr = process.communicate(json.dumps(test_data))
-print('Context Output:')
-print(stdout)
-print()
-print('STDERR:', stderr)
-print('Return Code:', process.returncode)
\ No newline at end of file
+# Pipes stay binary; hook output is forwarded as raw bytes without a decode
+stdout, stderr = process.communicate(json.dumps(test_data).encode())
+out = sys.stdout.buffer
+out.write(b'Context Output:\n' + stdout + b'\n\n')
+out.write(b'STDERR: ' + stderr + b'\n')
+out.flush()
+print('Return Code:', process.returncode)
@@ -260,13 +260,19 @@ test_tts_system() {
     if command -v pytest &> /dev/null; then
         log "  Running TTS unit tests..."
 
+        # Spread tests across CPUs when pytest-xdist is installed
+        local parallel_args=()
+        if python3 -c "import xdist" &> /dev/null; then
+            parallel_args=(-n auto)
+        fi
+
         # Run tests in quiet mode and capture output
-        if python3 -m pytest "$PROJECT_ROOT/tests/tts" -v --tb=short > /tmp/tts_test_output.log 2>&1; then
+        if python3 -m pytest "$PROJECT_ROOT/tests/tts" "${parallel_args[@]}" -v --tb=short > /tmp/tts_test_output.log 2>&1; then
             local test_count=$(grep -c "PASSED" /tmp/tts_test_output.log || echo 0)
             log "  ✅ TTS tests passed ($test_count tests)"
 
             # Run hook tests
-            if python3 -m pytest "$PROJECT_ROOT/tests/hooks" -v --tb=short > /tmp/hooks_test_output.log 2>&1; then
+            if python3 -m pytest "$PROJECT_ROOT/tests/hooks" "${parallel_args[@]}" -v --tb=short > /tmp/hooks_test_output.log 2>&1; then
                 local hook_test_count=$(grep -c "PASSED" /tmp/hooks_test_output.log || echo 0)
                 log "  ✅ Hook tests passed ($hook_test_count tests)"
                 return 0
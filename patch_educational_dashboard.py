@@ -2,22 +2,27 @@
 
 import re
 
-# Read the current file
-with open('apps/client/src/components/EducationalDashboard.vue', 'r') as f:
+# 1. Import statement anchor
+IMPORT_RE = re.compile(r"(import { beginnerFundamentalsPath } from '\.\./data/learningPaths';)")
+IMPORT_REPLACEMENT = r"\1\nimport { postToolUseAssessment } from '../data/assessments/postToolUseAssessment';"
+
+# 2. End of sampleAssessments
+ASSESSMENT_RE = re.compile(r"(\s*)\]\s*\n(\s*)}\s*\n};")
+ASSESSMENT_REPLACEMENT = r"\1]\n\2},\n\2post_tool_use: postToolUseAssessment\n};"
+
+# Read, patch and rewrite the file through a single handle
+with open('apps/client/src/components/EducationalDashboard.vue', 'r+') as f:
     content = f.read()
 
-# 1. Add the import statement
-import_pattern = r"(import { beginnerFundamentalsPath } from '\.\./data/learningPaths';)"
-import_replacement = r"\1\nimport { postToolUseAssessment } from '../data/assessments/postToolUseAssessment';"
-content = re.sub(import_pattern, import_replacement, content)
+    # 1. Add the import statement
+    content = IMPORT_RE.sub(IMPORT_REPLACEMENT, content)
 
-# 2. Add the assessment to sampleAssessments
-assessment_pattern = r"(\s*)\]\s*\n(\s*)}\s*\n};"
-assessment_replacement = r"\1]\n\2},\n\2post_tool_use: postToolUseAssessment\n};"
-content = re.sub(assessment_pattern, assessment_replacement, content)
+    # 2. Add the assessment to sampleAssessments
+    content = ASSESSMENT_RE.sub(ASSESSMENT_REPLACEMENT, content)
 
-# Write back to file
-with open('apps/client/src/components/EducationalDashboard.vue', 'w') as f:
+    # Write back to file
+    f.seek(0)
     f.write(content)
+    f.truncate()
 
-print("Successfully patched EducationalDashboard.vue with PostToolUse assessment!")
\ No newline at end of file
+print("Successfully patched EducationalDashboard.vue with PostToolUse assessment!")
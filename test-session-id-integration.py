@@ -12,19 +12,23 @@ Tests the complete session_id flow:
 Based on todo-list.md Phase 5 requirements.
 """
 
+import argparse
 import asyncio
 import json
 import os
+import re
+import socket
 import subprocess
 import sys
 import tempfile
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 import uuid
 import statistics
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
 # Test configuration
 PROJECT_NAME = "multi-agent-observability-system"
@@ -32,13 +36,105 @@ TEST_SESSION_FILE = Path(f"/tmp/claude_session_{PROJECT_NAME}")
 TEST_RESULTS_DIR = Path(__file__).parent / "test-results"
 PERFORMANCE_SAMPLES = 100
 TIMEOUT_SECONDS = 10
+# Compact JSON reports unless PRETTY_JSON is set for human reading
+PRETTY_JSON = bool(os.getenv("PRETTY_JSON"))
+HOOKS_DIR = Path(__file__).parent / ".claude" / "hooks"
+WORKER_HOOKS = ["session_event_tracker.py", "pre_tool_use.py", "post_tool_use.py"]
+
+# Shape of datetime.isoformat() timestamps, with month/day/time ranges checked;
+# test 1 only validates the format, so no datetime needs to be built
+ISO_TIMESTAMP_RE = re.compile(
+    r"\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])"
+    r"T(?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d(?:\.\d+)?(?:[+-]\d{2}:\d{2}|Z)?"
+)
+
+# Fixed hook inputs shared by tests 2, 3 and 7, serialized once
+PRE_TOOL_PAYLOAD = json.dumps({
+    "tool": "Read",
+    "parameters": {"file_path": "/tmp/test.txt"}
+}).encode('utf-8')
+POST_TOOL_PAYLOAD = json.dumps({
+    "tool_name": "Read",
+    "tool_input": {"file_path": "/tmp/test.txt"},
+    "tool_response": {"type": "text", "text": "Test content"}
+}).encode('utf-8')
+
+# session_helpers is imported once for the tests that call it directly
+_UTILS = str(HOOKS_DIR / "utils")
+if _UTILS not in sys.path:
+    sys.path.insert(0, _UTILS)
+try:
+    from session_helpers import store_session_id, get_stored_session_id, cleanup_stale_sessions
+    SESSION_HELPERS_AVAILABLE = True
+    SESSION_HELPERS_ERROR = None
+except ImportError as e:
+    SESSION_HELPERS_AVAILABLE = False
+    SESSION_HELPERS_ERROR = e
+
+def _bench_ns(operation: Callable[..., Any], calls: List[tuple]) -> List[int]:
+    """Time operation(*args) for each args tuple as one burst.
+
+    Returns integer nanosecond samples for calls that did not return False;
+    the sample list is preallocated so the timed loop does not grow it.
+    """
+    times = [0] * len(calls)
+    count = 0
+    for args in calls:
+        start_time = time.perf_counter_ns()
+        result = operation(*args)
+        end_time = time.perf_counter_ns()
+
+        if result is not False:
+            times[count] = end_time - start_time
+            count += 1
+    del times[count:]
+    return times
+
+def _latency_stats_ms(samples_ns: List[int]) -> Tuple[float, float, float]:
+    """Return (mean, max, 95th percentile) of nanosecond samples, in ms."""
+    p95 = statistics.quantiles(samples_ns, n=20)[18]
+    return statistics.fmean(samples_ns) / 1e6, max(samples_ns) / 1e6, p95 / 1e6
+
+def _read_last_jsonl(path: Path, tail_bytes: int = 8192) -> Optional[Dict[str, Any]]:
+    """Parse the last entry of a JSONL file, reading only the end of the file."""
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        while True:
+            offset = max(0, size - tail_bytes)
+            f.seek(offset)
+            blob = f.read().rstrip(b"\n")
+            newline = blob.rfind(b"\n")
+            # Widen the window until it holds the whole last line
+            if newline >= 0 or offset == 0:
+                last_line = blob[newline + 1:].strip()
+                return json.loads(last_line) if last_line else None
+            tail_bytes *= 2
 
 class SessionIDTester:
-    def __init__(self):
+    def __init__(self, serve: bool = True):
         self.test_results = []
         self.performance_data = []
         self.cleanup_files = []
 
+        # With serve=True each hook runs once as a --serve worker and every
+        # invocation goes over its Unix socket instead of a fresh process
+        self.serve = serve
+        self.socket_dir = None
+        self.hook_workers = {}
+        self.hook_sockets = {}
+
+        # Line-buffered JSONL log of finished tests, opened by setup
+        self._results_path = None
+        self._results_fh = None
+
+        # Session ID stored by test 1, reused by the retrieval tests
+        self._last_session_id = None
+
+        # PreToolUse log checked by tests 2 and 7, resolved once per run
+        self._today = datetime.now().strftime('%Y%m%d')
+        self._pre_log_file = (Path(__file__).parent / "logs" / "hooks" / "pre_tool_use" /
+                              f"pre_tool_use_{self._today}.jsonl")
+
     def setup_test_environment(self):
         """Set up test environment and cleanup any existing session files."""
         print("🔧 Setting up test environment...")
@@ -50,8 +146,11 @@ class SessionIDTester:
         # Create test results directory
         TEST_RESULTS_DIR.mkdir(exist_ok=True)
 
+        # Each finished test is streamed here so a crashed run keeps its progress
+        self._results_path = TEST_RESULTS_DIR / f"run_{os.getpid()}.jsonl"
+        self._results_fh = open(self._results_path, "w", buffering=1)
+
         # Verify hook scripts exist
-        hooks_dir = Path(__file__).parent / ".claude" / "hooks"
         required_hooks = [
             "session_event_tracker.py",
             "pre_tool_use.py",
@@ -61,19 +160,28 @@ class SessionIDTester:
 
         missing_hooks = []
         for hook in required_hooks:
-            hook_path = hooks_dir / hook
+            hook_path = HOOKS_DIR / hook
             if not hook_path.exists():
                 missing_hooks.append(str(hook_path))
 
         if missing_hooks:
             raise FileNotFoundError(f"Missing required hooks: {missing_hooks}")
 
+        if self.serve:
+            self.start_hook_workers()
+
         print(f"✅ Test environment ready. Session file path: {TEST_SESSION_FILE}")
 
     def cleanup_test_environment(self):
         """Clean up test files and temporary data."""
         print("🧹 Cleaning up test environment...")
 
+        self.stop_hook_workers()
+
+        if self._results_fh:
+            self._results_fh.close()
+            self._results_fh = None
+
         # Remove test session file
         if TEST_SESSION_FILE.exists():
             TEST_SESSION_FILE.unlink()
@@ -87,10 +195,96 @@ class SessionIDTester:
 
         print("✅ Test environment cleaned up")
 
+    def start_hook_workers(self):
+        """Launch each hook once in --serve mode and connect to its socket."""
+        self.socket_dir = Path(tempfile.mkdtemp(prefix="hook-workers-"))
+
+        for hook_name in WORKER_HOOKS:
+            socket_path = self.socket_dir / f"{Path(hook_name).stem}.sock"
+            self.hook_workers[hook_name] = subprocess.Popen(
+                [str(HOOKS_DIR / hook_name), "--serve", str(socket_path)],
+                stdin=subprocess.DEVNULL,
+                cwd=str(Path(__file__).parent)
+            )
+
+            # Wait for the worker to bind its socket
+            deadline = time.monotonic() + TIMEOUT_SECONDS
+            while not socket_path.exists():
+                if self.hook_workers[hook_name].poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"Hook worker failed to start: {hook_name}")
+                time.sleep(0.01)
+
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(TIMEOUT_SECONDS)
+            sock.connect(str(socket_path))
+            self.hook_sockets[hook_name] = (sock, sock.makefile('rb'))
+
+    def stop_hook_workers(self):
+        """Close worker connections and terminate the worker processes."""
+        for sock, reader in self.hook_sockets.values():
+            reader.close()
+            sock.close()
+        self.hook_sockets.clear()
+
+        for process in self.hook_workers.values():
+            process.terminate()
+            try:
+                process.wait(timeout=TIMEOUT_SECONDS)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.hook_workers.clear()
+
+        if self.socket_dir:
+            shutil.rmtree(self.socket_dir, ignore_errors=True)
+            self.socket_dir = None
+
+    def run_hook(self, hook_name: str, payload: bytes) -> subprocess.CompletedProcess:
+        """Run a hook with the JSON payload on stdin, via its worker when serving."""
+        hook_path = HOOKS_DIR / hook_name
+
+        if hook_name not in self.hook_sockets:
+            result = subprocess.run(
+                [str(hook_path)],
+                input=payload,
+                capture_output=True,
+                timeout=TIMEOUT_SECONDS,
+                cwd=str(Path(__file__).parent)
+            )
+            return subprocess.CompletedProcess(
+                result.args, result.returncode,
+                result.stdout.decode('utf-8', 'replace'), result.stderr.decode('utf-8', 'replace')
+            )
+
+        sock, reader = self.hook_sockets[hook_name]
+        try:
+            sock.sendall(payload + b"\n")
+            response = json.loads(reader.readline())
+        except socket.timeout:
+            raise subprocess.TimeoutExpired(str(hook_path), TIMEOUT_SECONDS)
+
+        return subprocess.CompletedProcess(
+            [str(hook_path)], response["returncode"], response["stdout"], response["stderr"]
+        )
+
     def generate_test_session_id(self) -> str:
         """Generate a test session ID."""
         return f"test-session-{uuid.uuid4().hex[:8]}-{int(time.time())}"
 
+    def _batch_session_ids(self, n: int) -> List[str]:
+        """Generate n test session IDs from one urandom read and one clock read."""
+        raw = os.urandom(4 * n)
+        timestamp = int(time.time())
+        return [f"test-session-{raw[i:i + 4].hex()}-{timestamp}" for i in range(0, 4 * n, 4)]
+
+    def _expected_session_id(self) -> Optional[str]:
+        """Session ID the retrieval tests should see, or None if none was stored."""
+        if self._last_session_id:
+            return self._last_session_id
+        try:
+            return TEST_SESSION_FILE.read_text().partition('\n')[0].strip()
+        except FileNotFoundError:
+            return None
+
     def test_1_session_start_storage(self) -> Dict[str, Any]:
         """Test 1: Verify SessionStart hook stores session_id correctly."""
         print("\n🔬 TEST 1: SessionStart Hook Storage")
@@ -102,47 +296,40 @@ class SessionIDTester:
         }
 
         # Run session_event_tracker.py with test input
-        hooks_dir = Path(__file__).parent / ".claude" / "hooks"
-        session_tracker = hooks_dir / "session_event_tracker.py"
-
         try:
             start_time = time.time()
-            result = subprocess.run(
-                [str(session_tracker)],
-                input=json.dumps(test_input),
-                text=True,
-                capture_output=True,
-                timeout=TIMEOUT_SECONDS,
-                cwd=str(Path(__file__).parent)
-            )
+            result = self.run_hook("session_event_tracker.py", json.dumps(test_input).encode('utf-8'))
             execution_time = (time.time() - start_time) * 1000  # ms
 
-            # Check if session file was created
-            file_exists = TEST_SESSION_FILE.exists()
-
-            # Check file contents if it exists
+            # Check if session file was created; one open serves the
+            # content and permission checks below
             file_content = ""
             file_format_valid = False
             stored_session_id = ""
+            file_stat = None
+
+            try:
+                fd = os.open(str(TEST_SESSION_FILE), os.O_RDONLY)
+            except FileNotFoundError:
+                file_exists = False
+            else:
+                file_exists = True
+                try:
+                    file_stat = os.fstat(fd)
+                    file_content = os.read(fd, file_stat.st_size).decode().strip()
+                finally:
+                    os.close(fd)
 
             if file_exists:
-                file_content = TEST_SESSION_FILE.read_text().strip()
-                lines = file_content.split('\n')
-                if len(lines) >= 2:
-                    stored_session_id = lines[0]
-                    timestamp_str = lines[1]
-                    try:
-                        datetime.fromisoformat(timestamp_str)
-                        file_format_valid = True
-                    except ValueError:
-                        pass
-
-            # Check file permissions
-            correct_permissions = False
-            if file_exists:
-                stat = TEST_SESSION_FILE.stat()
-                # Check if permissions are 0o600 (owner read/write only)
-                correct_permissions = oct(stat.st_mode)[-3:] == '600'
+                # Only the first two lines matter; partition avoids splitting the rest
+                first_line, separator, rest = file_content.partition('\n')
+                if separator:
+                    stored_session_id = first_line
+                    timestamp_str = rest.partition('\n')[0]
+                    file_format_valid = bool(ISO_TIMESTAMP_RE.fullmatch(timestamp_str))
+
+            # Check if permissions are 0o600 (owner read/write only)
+            correct_permissions = file_stat is not None and (file_stat.st_mode & 0o777) == 0o600
 
             test_result = {
                 "test_name": "SessionStart Storage",
@@ -162,6 +349,7 @@ class SessionIDTester:
             }
 
             if test_result["success"]:
+                self._last_session_id = test_session_id
                 print("✅ PASS: Session ID stored correctly with proper format and permissions")
             else:
                 print("❌ FAIL: Session ID storage failed")
@@ -191,43 +379,22 @@ class SessionIDTester:
         """Test 2: Verify PreToolUse hook retrieves correct session_id."""
         print("\n🔬 TEST 2: PreToolUse Hook Retrieval")
 
-        # First ensure we have a session file from test 1
-        if not TEST_SESSION_FILE.exists():
+        # Get expected session ID stored by test 1
+        expected_session_id = self._expected_session_id()
+        if not expected_session_id:
             return {
                 "test_name": "PreToolUse Retrieval",
                 "success": False,
                 "error": "No session file exists from previous test"
             }
 
-        # Get expected session ID from file
-        file_content = TEST_SESSION_FILE.read_text().strip()
-        expected_session_id = file_content.split('\n')[0]
-
-        # Create test tool use input
-        test_input = {
-            "tool": "Read",
-            "parameters": {"file_path": "/tmp/test.txt"}
-        }
-
-        hooks_dir = Path(__file__).parent / ".claude" / "hooks"
-        pre_tool_hook = hooks_dir / "pre_tool_use.py"
-
         try:
             start_time = time.time()
-            result = subprocess.run(
-                [str(pre_tool_hook)],
-                input=json.dumps(test_input),
-                text=True,
-                capture_output=True,
-                timeout=TIMEOUT_SECONDS,
-                cwd=str(Path(__file__).parent)
-            )
+            result = self.run_hook("pre_tool_use.py", PRE_TOOL_PAYLOAD)
             execution_time = (time.time() - start_time) * 1000  # ms
 
             # Check log files for session_id
-            logs_dir = Path(__file__).parent / "logs" / "hooks" / "pre_tool_use"
-            today = datetime.now().strftime('%Y%m%d')
-            log_file = logs_dir / f"pre_tool_use_{today}.jsonl"
+            log_file = self._pre_log_file
 
             session_id_found = "unknown"
             session_id_correct = False
@@ -236,13 +403,11 @@ class SessionIDTester:
             if log_file.exists():
                 try:
                     # Read the last line of the log file
-                    with open(log_file, 'r') as f:
-                        lines = f.readlines()
-                        if lines:
-                            last_entry = json.loads(lines[-1].strip())
-                            session_id_found = last_entry.get('session_id', 'unknown')
-                            session_id_correct = session_id_found == expected_session_id
-                            log_entry_found = True
+                    last_entry = _read_last_jsonl(log_file)
+                    if last_entry:
+                        session_id_found = last_entry.get('session_id', 'unknown')
+                        session_id_correct = session_id_found == expected_session_id
+                        log_entry_found = True
                 except Exception as e:
                     pass
 
@@ -282,38 +447,18 @@ class SessionIDTester:
         """Test 3: Verify PostToolUse hook retrieves correct session_id."""
         print("\n🔬 TEST 3: PostToolUse Hook Retrieval")
 
-        # Ensure session file exists
-        if not TEST_SESSION_FILE.exists():
+        # Get expected session ID stored by test 1
+        expected_session_id = self._expected_session_id()
+        if not expected_session_id:
             return {
                 "test_name": "PostToolUse Retrieval",
                 "success": False,
                 "error": "No session file exists from previous test"
             }
 
-        # Get expected session ID from file
-        file_content = TEST_SESSION_FILE.read_text().strip()
-        expected_session_id = file_content.split('\n')[0]
-
-        # Create test tool use response input
-        test_input = {
-            "tool_name": "Read",
-            "tool_input": {"file_path": "/tmp/test.txt"},
-            "tool_response": {"type": "text", "text": "Test content"}
-        }
-
-        hooks_dir = Path(__file__).parent / ".claude" / "hooks"
-        post_tool_hook = hooks_dir / "post_tool_use.py"
-
         try:
             start_time = time.time()
-            result = subprocess.run(
-                [str(post_tool_hook)],
-                input=json.dumps(test_input),
-                text=True,
-                capture_output=True,
-                timeout=TIMEOUT_SECONDS,
-                cwd=str(Path(__file__).parent)
-            )
+            result = self.run_hook("post_tool_use.py", POST_TOOL_PAYLOAD)
             execution_time = (time.time() - start_time) * 1000  # ms
 
             # Check if observability event was sent with correct session_id
@@ -364,159 +509,146 @@ class SessionIDTester:
         stale_timestamp = (datetime.now() - timedelta(hours=25)).isoformat()
 
         stale_content = f"{stale_session_id}\n{stale_timestamp}\n"
-        TEST_SESSION_FILE.write_text(stale_content)
+        fd = os.open(str(TEST_SESSION_FILE), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.write(fd, stale_content.encode())
+        finally:
+            os.close(fd)
 
         # Import and test the cleanup function directly
-        sys.path.append(str(Path(__file__).parent / ".claude" / "hooks" / "utils"))
-        try:
-            from session_helpers import get_stored_session_id, cleanup_stale_sessions
+        if not SESSION_HELPERS_AVAILABLE:
+            return {
+                "test_name": "TTL Cleanup",
+                "success": False,
+                "error": f"Could not import session_helpers: {SESSION_HELPERS_ERROR}"
+            }
 
-            # Test that stale session returns "unknown"
-            project_name = "multi-agent-observability-system"
-            retrieved_session_id = get_stored_session_id(project_name)
+        # Test that stale session returns "unknown"
+        project_name = "multi-agent-observability-system"
+        retrieved_session_id = get_stored_session_id(project_name)
 
-            # File should be automatically cleaned up by get_stored_session_id
-            file_exists_after_get = TEST_SESSION_FILE.exists()
+        # File should be automatically cleaned up by get_stored_session_id
+        file_exists_after_get = TEST_SESSION_FILE.exists()
 
-            # Test cleanup function directly
-            cleanup_count = cleanup_stale_sessions()
+        # Test cleanup function directly
+        cleanup_count = cleanup_stale_sessions()
 
-            test_result = {
-                "test_name": "TTL Cleanup",
-                "success": (retrieved_session_id == "unknown" and not file_exists_after_get),
-                "stale_session_id": stale_session_id,
-                "retrieved_session_id": retrieved_session_id,
-                "file_cleaned_up": not file_exists_after_get,
-                "cleanup_count": cleanup_count,
-                "stale_timestamp": stale_timestamp
-            }
+        test_result = {
+            "test_name": "TTL Cleanup",
+            "success": (retrieved_session_id == "unknown" and not file_exists_after_get),
+            "stale_session_id": stale_session_id,
+            "retrieved_session_id": retrieved_session_id,
+            "file_cleaned_up": not file_exists_after_get,
+            "cleanup_count": cleanup_count,
+            "stale_timestamp": stale_timestamp
+        }
 
-            if test_result["success"]:
-                print("✅ PASS: Stale session files cleaned up correctly")
-            else:
-                print("❌ FAIL: Stale session cleanup failed")
-                print(f"   Retrieved: {retrieved_session_id} (should be 'unknown')")
-                print(f"   File cleaned: {not file_exists_after_get}")
+        if test_result["success"]:
+            print("✅ PASS: Stale session files cleaned up correctly")
+        else:
+            print("❌ FAIL: Stale session cleanup failed")
+            print(f"   Retrieved: {retrieved_session_id} (should be 'unknown')")
+            print(f"   File cleaned: {not file_exists_after_get}")
 
-            return test_result
+        return test_result
+
+    def test_5_performance_benchmark(self) -> Dict[str, Any]:
+        """Test 5: Performance benchmark - file operations should be <5ms."""
+        print(f"\n🔬 TEST 5: Performance Benchmark ({PERFORMANCE_SAMPLES} samples)")
 
-        except ImportError as e:
+        if not SESSION_HELPERS_AVAILABLE:
             return {
-                "test_name": "TTL Cleanup",
+                "test_name": "Performance Benchmark",
                 "success": False,
-                "error": f"Could not import session_helpers: {e}"
+                "error": f"Could not import session_helpers: {SESSION_HELPERS_ERROR}"
             }
 
-    def test_5_performance_benchmark(self) -> Dict[str, Any]:
-        """Test 5: Performance benchmark - file operations should be <5ms."""
-        print(f"\n🔬 TEST 5: Performance Benchmark ({PERFORMANCE_SAMPLES} samples)")
+        project_name = "multi-agent-observability-system"
 
-        sys.path.append(str(Path(__file__).parent / ".claude" / "hooks" / "utils"))
-        try:
-            from session_helpers import store_session_id, get_stored_session_id
-
-            project_name = "multi-agent-observability-system"
-            store_times = []
-            get_times = []
-
-            # Benchmark store operations
-            print("   Benchmarking store operations...")
-            for i in range(PERFORMANCE_SAMPLES):
-                session_id = self.generate_test_session_id()
-
-                start_time = time.perf_counter()
-                success = store_session_id(session_id, project_name)
-                end_time = time.perf_counter()
-
-                if success:
-                    store_times.append((end_time - start_time) * 1000)  # Convert to ms
-
-            # Benchmark get operations
-            print("   Benchmarking get operations...")
-            for i in range(PERFORMANCE_SAMPLES):
-                start_time = time.perf_counter()
-                retrieved_id = get_stored_session_id(project_name)
-                end_time = time.perf_counter()
-
-                get_times.append((end_time - start_time) * 1000)  # Convert to ms
-
-            # Calculate statistics
-            if store_times and get_times:
-                store_avg = statistics.mean(store_times)
-                store_max = max(store_times)
-                store_p95 = statistics.quantiles(store_times, n=20)[18]  # 95th percentile
-
-                get_avg = statistics.mean(get_times)
-                get_max = max(get_times)
-                get_p95 = statistics.quantiles(get_times, n=20)[18]  # 95th percentile
-
-                # Success criteria: average < 5ms, p95 < 10ms
-                store_success = store_avg < 5.0 and store_p95 < 10.0
-                get_success = get_avg < 5.0 and get_p95 < 10.0
-
-                test_result = {
-                    "test_name": "Performance Benchmark",
-                    "success": store_success and get_success,
-                    "samples": PERFORMANCE_SAMPLES,
-                    "store_avg_ms": round(store_avg, 3),
-                    "store_max_ms": round(store_max, 3),
-                    "store_p95_ms": round(store_p95, 3),
-                    "store_meets_requirements": store_success,
-                    "get_avg_ms": round(get_avg, 3),
-                    "get_max_ms": round(get_max, 3),
-                    "get_p95_ms": round(get_p95, 3),
-                    "get_meets_requirements": get_success,
-                    "requirement_avg_ms": 5.0,
-                    "requirement_p95_ms": 10.0
-                }
+        # Session IDs are generated up front so only the file operation is timed
+        session_ids = self._batch_session_ids(PERFORMANCE_SAMPLES)
 
-                print(f"   Store: avg={store_avg:.2f}ms, max={store_max:.2f}ms, p95={store_p95:.2f}ms")
-                print(f"   Get:   avg={get_avg:.2f}ms, max={get_max:.2f}ms, p95={get_p95:.2f}ms")
+        # Benchmark store operations
+        print("   Benchmarking store operations...")
+        store_times = _bench_ns(store_session_id, [(session_id, project_name) for session_id in session_ids])
 
-                if test_result["success"]:
-                    print("✅ PASS: Performance requirements met (<5ms avg, <10ms p95)")
-                else:
-                    print("❌ FAIL: Performance requirements not met")
+        # Benchmark get operations
+        print("   Benchmarking get operations...")
+        get_times = _bench_ns(get_stored_session_id, [(project_name,)] * PERFORMANCE_SAMPLES)
 
-                return test_result
+        # Calculate statistics
+        if len(store_times) >= 2 and get_times:
+            store_avg, store_max, store_p95 = _latency_stats_ms(store_times)
+            get_avg, get_max, get_p95 = _latency_stats_ms(get_times)
+
+            # Success criteria: average < 5ms, p95 < 10ms
+            store_success = store_avg < 5.0 and store_p95 < 10.0
+            get_success = get_avg < 5.0 and get_p95 < 10.0
+
+            test_result = {
+                "test_name": "Performance Benchmark",
+                "success": store_success and get_success,
+                "samples": PERFORMANCE_SAMPLES,
+                "store_avg_ms": round(store_avg, 3),
+                "store_max_ms": round(store_max, 3),
+                "store_p95_ms": round(store_p95, 3),
+                "store_meets_requirements": store_success,
+                "get_avg_ms": round(get_avg, 3),
+                "get_max_ms": round(get_max, 3),
+                "get_p95_ms": round(get_p95, 3),
+                "get_meets_requirements": get_success,
+                "requirement_avg_ms": 5.0,
+                "requirement_p95_ms": 10.0
+            }
+
+            print(f"   Store: avg={store_avg:.2f}ms, max={store_max:.2f}ms, p95={store_p95:.2f}ms")
+            print(f"   Get:   avg={get_avg:.2f}ms, max={get_max:.2f}ms, p95={get_p95:.2f}ms")
+
+            if test_result["success"]:
+                print("✅ PASS: Performance requirements met (<5ms avg, <10ms p95)")
             else:
-                return {
-                    "test_name": "Performance Benchmark",
-                    "success": False,
-                    "error": "No timing data collected"
-                }
+                print("❌ FAIL: Performance requirements not met")
 
-        except ImportError as e:
+            return test_result
+        else:
             return {
                 "test_name": "Performance Benchmark",
                 "success": False,
-                "error": f"Could not import session_helpers: {e}"
+                "error": "No timing data collected"
             }
 
+
     def test_6_error_scenarios(self) -> Dict[str, Any]:
         """Test 6: Error scenario handling (missing files, corrupted data, permissions)."""
         print("\n🔬 TEST 6: Error Scenario Handling")
 
-        sys.path.append(str(Path(__file__).parent / ".claude" / "hooks" / "utils"))
-        try:
-            from session_helpers import get_stored_session_id, store_session_id
+        if not SESSION_HELPERS_AVAILABLE:
+            return {
+                "test_name": "Error Scenario Handling",
+                "success": False,
+                "error": f"Could not import session_helpers: {SESSION_HELPERS_ERROR}"
+            }
 
-            project_name = "multi-agent-observability-system"
-            error_scenarios = []
+        project_name = "multi-agent-observability-system"
+        error_scenarios = []
 
-            # Scenario 1: Missing file
-            if TEST_SESSION_FILE.exists():
-                TEST_SESSION_FILE.unlink()
+        # Scenario 1: Missing file
+        if TEST_SESSION_FILE.exists():
+            TEST_SESSION_FILE.unlink()
 
-            missing_file_result = get_stored_session_id(project_name)
-            error_scenarios.append({
-                "scenario": "missing_file",
-                "success": missing_file_result == "unknown",
-                "result": missing_file_result
-            })
+        missing_file_result = get_stored_session_id(project_name)
+        error_scenarios.append({
+            "scenario": "missing_file",
+            "success": missing_file_result == "unknown",
+            "result": missing_file_result
+        })
 
+        # Scenarios 2 and 3 rewrite the same file in place through one fd
+        # (neither leads get_stored_session_id to unlink it)
+        fd = os.open(str(TEST_SESSION_FILE), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
             # Scenario 2: Corrupted file content
-            TEST_SESSION_FILE.write_text("corrupted\ncontent\nextra\nlines")
+            os.pwrite(fd, b"corrupted\ncontent\nextra\nlines", 0)
             corrupted_result = get_stored_session_id(project_name)
             error_scenarios.append({
                 "scenario": "corrupted_content",
@@ -525,73 +657,86 @@ class SessionIDTester:
             })
 
             # Scenario 3: Invalid timestamp format
-            TEST_SESSION_FILE.write_text("valid-session-id\ninvalid-timestamp")
+            os.ftruncate(fd, 0)
+            os.pwrite(fd, b"valid-session-id\ninvalid-timestamp", 0)
             invalid_timestamp_result = get_stored_session_id(project_name)
             error_scenarios.append({
                 "scenario": "invalid_timestamp",
                 "success": invalid_timestamp_result == "unknown",
                 "result": invalid_timestamp_result
             })
+        finally:
+            os.close(fd)
 
-            # Scenario 4: Permission test (if possible)
-            # This is harder to test in an automated way without root privileges
-            # We'll skip this for now but note it in the results
-
-            # Scenario 5: Concurrent access test (atomic operations)
-            # Test that atomic operations work under concurrent access
-            concurrent_success = True
-            try:
-                # Simulate concurrent writes
-                session_ids = []
-                for i in range(10):
-                    session_id = self.generate_test_session_id()
-                    success = store_session_id(session_id, project_name)
-                    if success:
-                        # Immediately try to read it back
-                        retrieved = get_stored_session_id(project_name)
-                        session_ids.append((session_id, retrieved))
-
-                # Check that the last write won (atomic operations preserved)
-                if session_ids:
-                    last_written, last_retrieved = session_ids[-1]
-                    concurrent_success = last_written == last_retrieved
-
-            except Exception as e:
-                concurrent_success = False
-
-            error_scenarios.append({
-                "scenario": "concurrent_access",
-                "success": concurrent_success,
-                "result": "atomic operations preserved" if concurrent_success else "race condition detected"
-            })
-
-            # Calculate overall success
-            all_scenarios_passed = all(s["success"] for s in error_scenarios)
+        # Scenario 4: Permission test (if possible)
+        # This is harder to test in an automated way without root privileges
+        # We'll skip this for now but note it in the results
 
-            test_result = {
-                "test_name": "Error Scenario Handling",
-                "success": all_scenarios_passed,
-                "scenarios": error_scenarios,
-                "scenarios_tested": len(error_scenarios),
-                "scenarios_passed": sum(1 for s in error_scenarios if s["success"])
-            }
+        # Scenario 5: Concurrent access test (atomic operations)
+        # Test that atomic operations work under concurrent access
+        concurrent_success = True
+        observed_races = []
+        try:
+            # Interleave real concurrent writes and reads; every read must see
+            # a complete session ID that some writer stored (or "unknown"
+            # before the first write lands), never a torn or foreign value
+            session_ids = self._batch_session_ids(32)
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                stores = []
+                gets = []
+                for session_id in session_ids:
+                    stores.append(executor.submit(store_session_id, session_id, project_name))
+                    gets.append(executor.submit(get_stored_session_id, project_name))
+
+            valid_reads = set(session_ids) | {"unknown"}
+            observed_races = [get.result() for get in gets if get.result() not in valid_reads]
+            all_stored = all(store.result() for store in stores)
+
+            # Once the writers settle, the file holds one of the written IDs
+            final_read = get_stored_session_id(project_name)
+            concurrent_success = all_stored and not observed_races and final_read in session_ids
 
-            if test_result["success"]:
-                print("✅ PASS: All error scenarios handled correctly")
-            else:
-                print("❌ FAIL: Some error scenarios not handled correctly")
-                for scenario in error_scenarios:
-                    status = "✅" if scenario["success"] else "❌"
-                    print(f"   {status} {scenario['scenario']}: {scenario['result']}")
+        except Exception as e:
+            concurrent_success = False
+
+        error_scenarios.append({
+            "scenario": "concurrent_access",
+            "success": concurrent_success,
+            "result": "atomic operations preserved" if concurrent_success else "race condition detected",
+            "observed_races": observed_races
+        })
+
+        # Scenario 6: Every store renamed its temp file over the session
+        # file, so the concurrent writes above left no temp files behind
+        leftover_temp_files = sorted(
+            path.name for path in TEST_SESSION_FILE.parent.glob(f"claude_session_{project_name}_*.tmp")
+        )
+        error_scenarios.append({
+            "scenario": "no_leftover_temp_files",
+            "success": not leftover_temp_files,
+            "result": "no temp files left" if not leftover_temp_files else f"leftover temp files: {leftover_temp_files}"
+        })
+
+        # Calculate overall success
+        all_scenarios_passed = all(s["success"] for s in error_scenarios)
+
+        test_result = {
+            "test_name": "Error Scenario Handling",
+            "success": all_scenarios_passed,
+            "scenarios": error_scenarios,
+            "scenarios_tested": len(error_scenarios),
+            "scenarios_passed": sum(1 for s in error_scenarios if s["success"])
+        }
 
-            return test_result
+        if test_result["success"]:
+            print("✅ PASS: All error scenarios handled correctly")
+        else:
+            print("❌ FAIL: Some error scenarios not handled correctly")
+            for scenario in error_scenarios:
+                status = "✅" if scenario["success"] else "❌"
+                print(f"   {status} {scenario['scenario']}: {scenario['result']}")
 
-        except ImportError as e:
-            return {
-                "test_name": "Error Scenario Handling",
-                "success": False,
-                "error": f"Could not import session_helpers: {e}"
-            }
+        return test_result
 
     def test_7_end_to_end_workflow(self) -> Dict[str, Any]:
         """Test 7: Complete end-to-end workflow simulation."""
@@ -608,54 +753,17 @@ class SessionIDTester:
             "source": "startup"
         }
 
-        hooks_dir = Path(__file__).parent / ".claude" / "hooks"
-
         try:
             # Execute SessionStart
-            session_tracker = hooks_dir / "session_event_tracker.py"
-            result1 = subprocess.run(
-                [str(session_tracker)],
-                input=json.dumps(session_start_input),
-                text=True,
-                capture_output=True,
-                timeout=TIMEOUT_SECONDS,
-                cwd=str(Path(__file__).parent)
-            )
+            result1 = self.run_hook("session_event_tracker.py", json.dumps(session_start_input).encode('utf-8'))
 
             session_stored = TEST_SESSION_FILE.exists()
 
             # Step 2: PreToolUse
-            pre_tool_input = {
-                "tool": "Read",
-                "parameters": {"file_path": "/tmp/test.txt"}
-            }
-
-            pre_tool_hook = hooks_dir / "pre_tool_use.py"
-            result2 = subprocess.run(
-                [str(pre_tool_hook)],
-                input=json.dumps(pre_tool_input),
-                text=True,
-                capture_output=True,
-                timeout=TIMEOUT_SECONDS,
-                cwd=str(Path(__file__).parent)
-            )
+            result2 = self.run_hook("pre_tool_use.py", PRE_TOOL_PAYLOAD)
 
             # Step 3: PostToolUse
-            post_tool_input = {
-                "tool_name": "Read",
-                "tool_input": {"file_path": "/tmp/test.txt"},
-                "tool_response": {"type": "text", "text": "Test content"}
-            }
-
-            post_tool_hook = hooks_dir / "post_tool_use.py"
-            result3 = subprocess.run(
-                [str(post_tool_hook)],
-                input=json.dumps(post_tool_input),
-                text=True,
-                capture_output=True,
-                timeout=TIMEOUT_SECONDS,
-                cwd=str(Path(__file__).parent)
-            )
+            result3 = self.run_hook("post_tool_use.py", POST_TOOL_PAYLOAD)
 
             # Step 4: Verify session correlation
             # Check that all hooks used the same session_id
@@ -663,18 +771,14 @@ class SessionIDTester:
             correlation_details = {}
 
             # Check PreToolUse log
-            pre_logs_dir = Path(__file__).parent / "logs" / "hooks" / "pre_tool_use"
-            today = datetime.now().strftime('%Y%m%d')
-            pre_log_file = pre_logs_dir / f"pre_tool_use_{today}.jsonl"
+            pre_log_file = self._pre_log_file
 
             pre_session_id = "not_found"
             if pre_log_file.exists():
                 try:
-                    with open(pre_log_file, 'r') as f:
-                        lines = f.readlines()
-                        if lines:
-                            last_entry = json.loads(lines[-1].strip())
-                            pre_session_id = last_entry.get('session_id', 'not_found')
+                    last_entry = _read_last_jsonl(pre_log_file)
+                    if last_entry:
+                        pre_session_id = last_entry.get('session_id', 'not_found')
                 except Exception:
                     pass
 
@@ -723,19 +827,56 @@ class SessionIDTester:
                 "error": str(e)
             }
 
+    def count_passed_tests(self) -> int:
+        """Count passed tests."""
+        return sum(1 for result in self.test_results if result.get("success", False))
+
     def calculate_success_rate(self) -> float:
         """Calculate overall session correlation success rate."""
         if not self.test_results:
             return 0.0
 
-        passed_tests = sum(1 for result in self.test_results if result.get("success", False))
-        return (passed_tests / len(self.test_results)) * 100
+        return (self.count_passed_tests() / len(self.test_results)) * 100
 
-    def generate_test_report(self) -> str:
-        """Generate comprehensive test report."""
-        success_rate = self.calculate_success_rate()
+    def iter_test_report_lines(self) -> Iterator[str]:
+        """Yield the comprehensive test report line by line."""
+        # One pass over the results formats the details, counts passes and
+        # indexes results by name; the details are held back because the
+        # header needs the pass count
+        passed = 0
+        details = []
+        by_name = {}
+        for i, result in enumerate(self.test_results, 1):
+            by_name.setdefault(result['test_name'], result)
+            success = result.get("success", False)
+            passed += bool(success)
+            status = "✅ PASS" if success else "❌ FAIL"
+            details.append(f"{i}. {result['test_name']}: {status}")
+
+            if "execution_time_ms" in result:
+                details.append(f"   Execution Time: {result['execution_time_ms']:.2f}ms")
+
+            if "error" in result:
+                details.append(f"   Error: {result['error']}")
+
+            # Add specific details for each test
+            if result['test_name'] == "Performance Benchmark" and success:
+                details.append(f"   Store Operations: {result['store_avg_ms']:.2f}ms avg, {result['store_p95_ms']:.2f}ms p95")
+                details.append(f"   Get Operations: {result['get_avg_ms']:.2f}ms avg, {result['get_p95_ms']:.2f}ms p95")
+
+            elif result['test_name'] == "Error Scenario Handling":
+                scenarios_passed = result.get('scenarios_passed', 0)
+                total = result.get('scenarios_tested', 0)
+                details.append(f"   Scenarios: {scenarios_passed}/{total} passed")
 
-        report = [
+            elif result['test_name'] == "End-to-End Workflow" and success:
+                details.append(f"   Session ID: {result['test_session_id']}")
+
+            details.append("")
+
+        success_rate = (passed / len(self.test_results)) * 100 if self.test_results else 0.0
+
+        yield from [
             "=" * 80,
             "SESSION ID FILE PERSISTENCE INTEGRATION TEST REPORT",
             "=" * 80,
@@ -748,37 +889,12 @@ class SessionIDTester:
             "DETAILED RESULTS:",
             "-" * 40
         ]
-
-        for i, result in enumerate(self.test_results, 1):
-            status = "✅ PASS" if result.get("success", False) else "❌ FAIL"
-            report.append(f"{i}. {result['test_name']}: {status}")
-
-            if "execution_time_ms" in result:
-                report.append(f"   Execution Time: {result['execution_time_ms']:.2f}ms")
-
-            if "error" in result:
-                report.append(f"   Error: {result['error']}")
-
-            # Add specific details for each test
-            if result['test_name'] == "Performance Benchmark" and result.get("success"):
-                report.append(f"   Store Operations: {result['store_avg_ms']:.2f}ms avg, {result['store_p95_ms']:.2f}ms p95")
-                report.append(f"   Get Operations: {result['get_avg_ms']:.2f}ms avg, {result['get_p95_ms']:.2f}ms p95")
-
-            elif result['test_name'] == "Error Scenario Handling":
-                passed = result.get('scenarios_passed', 0)
-                total = result.get('scenarios_tested', 0)
-                report.append(f"   Scenarios: {passed}/{total} passed")
-
-            elif result['test_name'] == "End-to-End Workflow" and result.get("success"):
-                report.append(f"   Session ID: {result['test_session_id']}")
-
-            report.append("")
+        yield from details
 
         # Performance summary
-        perf_results = [r for r in self.test_results if r['test_name'] == "Performance Benchmark"]
-        if perf_results and perf_results[0].get("success"):
-            perf = perf_results[0]
-            report.extend([
+        perf = by_name.get("Performance Benchmark")
+        if perf and perf.get("success"):
+            yield from [
                 "PERFORMANCE ANALYSIS:",
                 "-" * 30,
                 f"File Operations Target: <5ms average overhead",
@@ -788,10 +904,10 @@ class SessionIDTester:
                 f"Store P95: {perf['store_p95_ms']:.2f}ms ({'✅ PASS' if perf['store_p95_ms'] < 10.0 else '❌ FAIL'})",
                 f"Get P95: {perf['get_p95_ms']:.2f}ms ({'✅ PASS' if perf['get_p95_ms'] < 10.0 else '❌ FAIL'})",
                 ""
-            ])
+            ]
 
         # Final assessment
-        report.extend([
+        yield from [
             "FINAL ASSESSMENT:",
             "-" * 20,
             f"✓ Session ID files created atomically with proper permissions",
@@ -804,16 +920,23 @@ class SessionIDTester:
             f"Overall System Status: {'🟢 READY FOR PRODUCTION' if success_rate >= 95.0 else '🟡 NEEDS ATTENTION'}",
             f"Session Correlation Rate: {success_rate:.1f}% ({'meets' if success_rate >= 95.0 else 'below'} 95% target)",
             ""
-        ])
+        ]
 
-        return "\n".join(report)
+    def generate_test_report(self) -> str:
+        """Generate comprehensive test report."""
+        return "\n".join(self.iter_test_report_lines())
 
-    def save_test_report(self, report: str):
-        """Save test report to file."""
+    def save_test_report(self, echo: bool = False):
+        """Save test report to file, also writing it to stdout when echo is set."""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         report_file = TEST_RESULTS_DIR / f"session_id_integration_test_{timestamp}.txt"
 
-        report_file.write_text(report)
+        # Lines go straight to the file (and stdout) without joining the report
+        with open(report_file, 'w', buffering=1 << 16) as f:
+            for line in self.iter_test_report_lines():
+                if echo:
+                    sys.stdout.write(line + "\n")
+                f.write(line + "\n")
         print(f"\n📊 Test report saved: {report_file}")
 
         # Also create a JSON report for programmatic analysis
@@ -821,16 +944,61 @@ class SessionIDTester:
             "timestamp": datetime.now().isoformat(),
             "success_rate": self.calculate_success_rate(),
             "total_tests": len(self.test_results),
-            "passed_tests": sum(1 for r in self.test_results if r.get("success", False)),
+            "passed_tests": self.count_passed_tests(),
             "test_results": self.test_results
         }
 
         json_file = TEST_RESULTS_DIR / f"session_id_integration_test_{timestamp}.json"
-        json_file.write_text(json.dumps(json_report, indent=2))
+        # Stream the encoder's chunks through one large buffer instead of
+        # building the whole JSON document as a string first
+        with open(json_file, 'w', buffering=1 << 16) as f:
+            if PRETTY_JSON:
+                json.dump(json_report, f, indent=2)
+            else:
+                json.dump(json_report, f, separators=(",", ":"))
         print(f"📊 JSON report saved: {json_file}")
 
+        # The JSON report now holds every result, so the progress log is
+        # only kept for runs that die before getting this far
+        self.discard_results_log()
+
+    def discard_results_log(self):
+        """Close and delete this run's progress log."""
+        if self._results_fh:
+            self._results_fh.close()
+            self._results_fh = None
+        if self._results_path:
+            self._results_path.unlink(missing_ok=True)
+            self._results_path = None
+
+    async def run_test_groups(self):
+        """Run the tests group by group; tests within a group run concurrently.
+
+        Tests 2 and 3 only read the session file written by test 1, so they
+        share a group. Tests 4-7 all rewrite or delete TEST_SESSION_FILE and
+        must each run alone.
+        """
+        test_groups = [
+            [self.test_1_session_start_storage],
+            [self.test_2_pre_tool_use_retrieval, self.test_3_post_tool_use_retrieval],
+            [self.test_4_ttl_cleanup],
+            [self.test_5_performance_benchmark],
+            [self.test_6_error_scenarios],
+            [self.test_7_end_to_end_workflow]
+        ]
+
+        for group in test_groups:
+            # Each test blocks on hook I/O, so run it on a worker thread
+            results = await asyncio.gather(*(asyncio.to_thread(test_method) for test_method in group))
+            for result in results:
+                self._results_fh.write(json.dumps(result) + "\n")
+            self.test_results.extend(results)
+
+            # Small delay between groups
+            await asyncio.sleep(0.1)
+
     def run_all_tests(self):
-        """Run all integration tests in sequence."""
+        """Run all integration tests, respecting their data dependencies."""
         print("🚀 Starting Session ID File Persistence Integration Tests")
         print(f"Target: >95% session correlation success rate")
         print(f"Performance: <5ms overhead for file operations")
@@ -838,28 +1006,10 @@ class SessionIDTester:
         try:
             self.setup_test_environment()
 
-            # Run all tests in order
-            test_methods = [
-                self.test_1_session_start_storage,
-                self.test_2_pre_tool_use_retrieval,
-                self.test_3_post_tool_use_retrieval,
-                self.test_4_ttl_cleanup,
-                self.test_5_performance_benchmark,
-                self.test_6_error_scenarios,
-                self.test_7_end_to_end_workflow
-            ]
-
-            for test_method in test_methods:
-                result = test_method()
-                self.test_results.append(result)
-
-                # Small delay between tests
-                time.sleep(0.1)
+            asyncio.run(self.run_test_groups())
 
             # Generate and save report
-            report = self.generate_test_report()
-            print(report)
-            self.save_test_report(report)
+            self.save_test_report(echo=True)
 
             # Final status
             success_rate = self.calculate_success_rate()
@@ -879,7 +1029,12 @@ class SessionIDTester:
 
 def main():
     """Main test execution."""
-    tester = SessionIDTester()
+    parser = argparse.ArgumentParser(description="Session ID file persistence integration tests")
+    parser.add_argument("--no-serve", action="store_true",
+                        help="Run every hook invocation as a fresh process instead of via hook workers")
+    args = parser.parse_args()
+
+    tester = SessionIDTester(serve=not args.no_serve)
     success = tester.run_all_tests()
     sys.exit(0 if success else 1)
 
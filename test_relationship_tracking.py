@@ -4,33 +4,32 @@ Test script for relationship tracking system
 """
 
 import json
-import subprocess
 import os
+import runpy
 import sys
 from pathlib import Path
 
-def run_hook_test(hook_name, test_data, env_vars=None):
-    """Run a hook test with given data and environment variables"""
-    env = os.environ.copy()
+HOOKS_DIR = Path(__file__).parent / ".claude" / "hooks"
+sys.path.insert(0, str(HOOKS_DIR))
+
+from utils.hook_server import run_once
+
+def run_hook_test(hook_name, test_data, env_vars=None, args=('--no-redis', '--no-server')):
+    """Run a hook in-process with given data and environment variables"""
+    # The hook script runs as __main__ in this interpreter, so each test
+    # pays for executing the hook rather than for starting a new python3
+    hook_path = str(HOOKS_DIR / hook_name)
+    saved_argv, saved_env = sys.argv, os.environ.copy()
+    sys.argv = [hook_path, *args]
     if env_vars:
-        env.update(env_vars)
-    
-    hook_path = f".claude/hooks/{hook_name}"
-    process = subprocess.Popen(
-        ['python3', hook_path, '--no-redis', '--no-server'],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        env=env
-    )
-    
-    stdout, stderr = process.communicate(json.dumps(test_data))
-    return {
-        'stdout': stdout,
-        'stderr': stderr,
-        'returncode': process.returncode
-    }
+        os.environ.update(env_vars)
+    
+    try:
+        return run_once(lambda: runpy.run_path(hook_path, run_name='__main__'), json.dumps(test_data))
+    finally:
+        sys.argv = saved_argv
+        os.environ.clear()
+        os.environ.update(saved_env)
 
 def test_relationship_tracking():
     """Test the complete relationship tracking workflow"""
@@ -141,17 +140,9 @@ def test_relationship_tracking():
     # Remove the continue session detection for this test
     env_vars['CLAUDE_SKIP_CONTEXT'] = 'false'
     
-    context_process = subprocess.Popen(
-        ['python3', '.claude/hooks/session_context_loader.py'],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        env=env_vars
-    )
-    
-    stdout, stderr = context_process.communicate(json.dumps(context_data))
-    print(f"Return Code: {context_process.returncode}")
+    result = run_hook_test('session_context_loader.py', context_data, env_vars, args=())
+    print(f"Return Code: {result['returncode']}")
+    stdout, stderr = result['stdout'], result['stderr']
     if stdout:
         lines = stdout.split('\n')
         print("Context Preview:")
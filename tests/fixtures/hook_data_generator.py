@@ -6,11 +6,69 @@ Provides realistic test data that covers the exact scenarios that caused
 the original regression, plus edge cases for preventing future regressions.
 """
 
+import itertools
 import json
 import time
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-import uuid
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _dumps(data: Any) -> str:
+    """Encode fixture data as a JSON string, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+# Default IDs come from a counter: unique within a run, and reproducible
+# across runs, unlike uuid4
+_id_counter = itertools.count()
+
+def _next_id(prefix: str) -> str:
+    """Return the next fixture ID for prefix, e.g. test-session-0000002a."""
+    return f"{prefix}-{next(_id_counter):08x}"
+
+# Default event timestamps: read the clock once, then step 1ms per event
+_timestamp_base = int(time.time() * 1000)
+_timestamp_counter = itertools.count()
+
+# File contents that mention timeouts without any error having occurred
+TIMEOUT_WRITE_CONTENT = """
+# Timeout configuration
+TIMEOUT = 30
+CONNECTION_TIMEOUT = 5.0
+REQUEST_TIMEOUT = 10.0
+
+def handle_timeout():
+    # Handle timeout scenarios
+    pass
+"""
+TIMEOUT_WRITE_LINES = TIMEOUT_WRITE_CONTENT.count('\n') + 1
+
+TIMEOUT_READ_CONTENT = """
+#!/usr/bin/env python3
+# Configuration file with timeout settings
+
+DEFAULT_TIMEOUT = 30  # seconds
+CONNECTION_TIMEOUT = 5.0
+REQUEST_TIMEOUT = 10.0
+
+class TimeoutHandler:
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        self.timeout = timeout
+    
+    def handle_timeout(self):
+        print("Timeout occurred")
+"""
+TIMEOUT_READ_LINES = TIMEOUT_READ_CONTENT.count('\n') + 1
+
+TIMEOUT_ERROR_MESSAGE = "Operation timed out after 30 seconds"
+ERROR_FILE_PATH_BY_TOOL = {"Read": "/nonexistent/file.txt"}
 
 class HookDataGenerator:
     """Generates realistic hook input data for testing."""
@@ -19,17 +77,19 @@ class HookDataGenerator:
     def create_base_hook_input(
         tool_name: str,
         session_id: Optional[str] = None,
-        use_legacy_format: bool = False
+        use_legacy_format: bool = False,
+        tool_input: Optional[Dict[str, Any]] = None,
+        tool_response: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Create base hook input structure."""
-        session_id = session_id or f"test-session-{uuid.uuid4().hex[:8]}"
+        """Create hook input structure around the given tool input and response."""
+        session_id = session_id or _next_id("test-session")
         
         if use_legacy_format:
             return {
                 "session_id": session_id,
                 "tool": tool_name,
-                "parameters": {},
-                "tool_response": {}
+                "parameters": tool_input if tool_input is not None else {},
+                "tool_response": tool_response if tool_response is not None else {}
             }
         else:
             return {
@@ -38,8 +98,8 @@ class HookDataGenerator:
                 "cwd": "/test/project",
                 "hook_event_name": "PostToolUse",
                 "tool_name": tool_name,
-                "tool_input": {},
-                "tool_response": {}
+                "tool_input": tool_input if tool_input is not None else {},
+                "tool_response": tool_response if tool_response is not None else {}
             }
     
     @staticmethod
@@ -51,33 +111,27 @@ class HookDataGenerator:
     ) -> Dict[str, Any]:
         """Generate Write operation hook data."""
         if include_timeout_content:
-            content = """
-# Timeout configuration
-TIMEOUT = 30
-CONNECTION_TIMEOUT = 5.0
-REQUEST_TIMEOUT = 10.0
-
-def handle_timeout():
-    # Handle timeout scenarios
-    pass
-"""
+            content, num_lines = TIMEOUT_WRITE_CONTENT, TIMEOUT_WRITE_LINES
+        else:
+            num_lines = content.count('\n') + 1
         
-        hook_data = HookDataGenerator.create_base_hook_input("Write", session_id)
-        hook_data["tool_input"] = {
-            "file_path": file_path,
-            "content": content
-        }
-        hook_data["tool_response"] = {
-            "type": "text",
-            "file": {
-                "filePath": file_path,
-                "content": content,
-                "numLines": len(content.split('\n')),
-                "startLine": 1,
-                "totalLines": len(content.split('\n'))
+        return HookDataGenerator.create_base_hook_input(
+            "Write", session_id,
+            tool_input={
+                "file_path": file_path,
+                "content": content
+            },
+            tool_response={
+                "type": "text",
+                "file": {
+                    "filePath": file_path,
+                    "content": content,
+                    "numLines": num_lines,
+                    "startLine": 1,
+                    "totalLines": num_lines
+                }
             }
-        }
-        return hook_data
+        )
     
     @staticmethod
     def read_operation(
@@ -88,37 +142,26 @@ def handle_timeout():
     ) -> Dict[str, Any]:
         """Generate Read operation hook data."""
         if include_timeout_in_content:
-            content = """
-#!/usr/bin/env python3
-# Configuration file with timeout settings
-
-DEFAULT_TIMEOUT = 30  # seconds
-CONNECTION_TIMEOUT = 5.0
-REQUEST_TIMEOUT = 10.0
-
-class TimeoutHandler:
-    def __init__(self, timeout=DEFAULT_TIMEOUT):
-        self.timeout = timeout
-    
-    def handle_timeout(self):
-        print("Timeout occurred")
-"""
+            content, num_lines = TIMEOUT_READ_CONTENT, TIMEOUT_READ_LINES
+        else:
+            num_lines = content.count('\n') + 1
         
-        hook_data = HookDataGenerator.create_base_hook_input("Read", session_id)
-        hook_data["tool_input"] = {
-            "file_path": file_path
-        }
-        hook_data["tool_response"] = {
-            "type": "text",
-            "file": {
-                "filePath": file_path,
-                "content": content,
-                "numLines": len(content.split('\n')),
-                "startLine": 1,
-                "totalLines": len(content.split('\n'))
+        return HookDataGenerator.create_base_hook_input(
+            "Read", session_id,
+            tool_input={
+                "file_path": file_path
+            },
+            tool_response={
+                "type": "text",
+                "file": {
+                    "filePath": file_path,
+                    "content": content,
+                    "numLines": num_lines,
+                    "startLine": 1,
+                    "totalLines": num_lines
+                }
             }
-        }
-        return hook_data
+        )
     
     @staticmethod
     def edit_operation(
@@ -128,21 +171,22 @@ class TimeoutHandler:
         session_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Generate Edit operation hook data."""
-        hook_data = HookDataGenerator.create_base_hook_input("Edit", session_id)
-        hook_data["tool_input"] = {
-            "file_path": file_path,
-            "old_string": old_string,
-            "new_string": new_string
-        }
-        hook_data["tool_response"] = {
-            "type": "update",
-            "numChanges": 1,
-            "file": {
-                "filePath": file_path,
-                "modified": True
+        return HookDataGenerator.create_base_hook_input(
+            "Edit", session_id,
+            tool_input={
+                "file_path": file_path,
+                "old_string": old_string,
+                "new_string": new_string
+            },
+            tool_response={
+                "type": "update",
+                "numChanges": 1,
+                "file": {
+                    "filePath": file_path,
+                    "modified": True
+                }
             }
-        }
-        return hook_data
+        )
     
     @staticmethod
     def bash_operation(
@@ -153,19 +197,20 @@ class TimeoutHandler:
         session_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Generate Bash operation hook data."""
-        hook_data = HookDataGenerator.create_base_hook_input("Bash", session_id)
-        hook_data["tool_input"] = {
-            "command": command,
-            "description": f"Execute: {command}"
-        }
-        hook_data["tool_response"] = {
-            "stdout": stdout,
-            "stderr": stderr,
-            "returncode": returncode,
-            "interrupted": False,
-            "isImage": False
-        }
-        return hook_data
+        return HookDataGenerator.create_base_hook_input(
+            "Bash", session_id,
+            tool_input={
+                "command": command,
+                "description": f"Execute: {command}"
+            },
+            tool_response={
+                "stdout": stdout,
+                "stderr": stderr,
+                "returncode": returncode,
+                "interrupted": False,
+                "isImage": False
+            }
+        )
     
     @staticmethod
     def grep_operation(
@@ -177,17 +222,18 @@ class TimeoutHandler:
         """Generate Grep operation hook data."""
         matches = matches or ["test_file.py:10:test function", "test_data.txt:5:test data"]
         
-        hook_data = HookDataGenerator.create_base_hook_input("Grep", session_id)
-        hook_data["tool_input"] = {
-            "pattern": pattern,
-            "path": path,
-            "output_mode": "content"
-        }
-        hook_data["tool_response"] = {
-            "matches": matches,
-            "total_matches": len(matches)
-        }
-        return hook_data
+        return HookDataGenerator.create_base_hook_input(
+            "Grep", session_id,
+            tool_input={
+                "pattern": pattern,
+                "path": path,
+                "output_mode": "content"
+            },
+            tool_response={
+                "matches": matches,
+                "total_matches": len(matches)
+            }
+        )
     
     @staticmethod
     def error_operation(
@@ -197,18 +243,16 @@ class TimeoutHandler:
         session_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Generate hook data with error conditions."""
-        if is_timeout:
-            error_message = "Operation timed out after 30 seconds"
-        
-        hook_data = HookDataGenerator.create_base_hook_input(tool_name, session_id)
-        hook_data["tool_input"] = {
-            "file_path": "/nonexistent/file.txt" if tool_name == "Read" else "test"
-        }
-        hook_data["tool_response"] = {
-            "error": error_message,
-            "is_error": True
-        }
-        return hook_data
+        return HookDataGenerator.create_base_hook_input(
+            tool_name, session_id,
+            tool_input={
+                "file_path": ERROR_FILE_PATH_BY_TOOL.get(tool_name, "test")
+            },
+            tool_response={
+                "error": TIMEOUT_ERROR_MESSAGE if is_timeout else error_message,
+                "is_error": True
+            }
+        )
     
     @staticmethod
     def legacy_format_operation(
@@ -216,16 +260,17 @@ class TimeoutHandler:
         session_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Generate hook data in the old format that caused the regression."""
-        hook_data = HookDataGenerator.create_base_hook_input(tool_name, session_id, use_legacy_format=True)
-        hook_data["parameters"] = {
-            "file_path": "/test/legacy_format.txt",
-            "content": "Legacy format test"
-        }
-        hook_data["tool_response"] = {
-            "success": True,
-            "result": "File written successfully"
-        }
-        return hook_data
+        return HookDataGenerator.create_base_hook_input(
+            tool_name, session_id, use_legacy_format=True,
+            tool_input={
+                "file_path": "/test/legacy_format.txt",
+                "content": "Legacy format test"
+            },
+            tool_response={
+                "success": True,
+                "result": "File written successfully"
+            }
+        )
 
 class RegressionScenarios:
     """Specific scenarios that reproduce the original regression."""
@@ -274,13 +319,16 @@ class RegressionScenarios:
     @staticmethod
     def mixed_format_batch() -> List[Dict[str, Any]]:
         """Generate a batch of events with mixed formats to test compatibility."""
-        return [
-            HookDataGenerator.write_operation(session_id="batch-test-1"),
-            HookDataGenerator.legacy_format_operation(session_id="batch-test-2"),
-            HookDataGenerator.read_operation(include_timeout_in_content=True, session_id="batch-test-3"),
-            HookDataGenerator.bash_operation(command="echo 'timeout test'", session_id="batch-test-4"),
-            RegressionScenarios.unknown_tool_scenario()
-        ]
+        return [dict(data) for data in _MIXED_BATCH]
+
+# Built once; mixed_format_batch hands out shallow copies
+_MIXED_BATCH = (
+    HookDataGenerator.write_operation(session_id="batch-test-1"),
+    HookDataGenerator.legacy_format_operation(session_id="batch-test-2"),
+    HookDataGenerator.read_operation(include_timeout_in_content=True, session_id="batch-test-3"),
+    HookDataGenerator.bash_operation(command="echo 'timeout test'", session_id="batch-test-4"),
+    RegressionScenarios.unknown_tool_scenario()
+)
 
 class DatabaseFixtures:
     """Fixtures for database testing."""
@@ -289,11 +337,13 @@ class DatabaseFixtures:
     def create_event_with_summary(
         tool_name: str,
         summary: str,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        timestamp: Optional[int] = None
     ) -> Dict[str, Any]:
         """Create a complete database event entry."""
-        session_id = session_id or f"db-test-{uuid.uuid4().hex[:8]}"
-        timestamp = int(time.time() * 1000)
+        session_id = session_id or _next_id("db-test")
+        if timestamp is None:
+            timestamp = _timestamp_base + next(_timestamp_counter)
         
         return {
             "source_app": "claude-code",
@@ -315,21 +365,32 @@ class DatabaseFixtures:
     @staticmethod
     def problematic_events_before_fix() -> List[Dict[str, Any]]:
         """Events that would have been problematic before the fix."""
-        return [
-            DatabaseFixtures.create_event_with_summary("unknown", "Tool used: unknown"),
-            DatabaseFixtures.create_event_with_summary("unknown", "Tool used: unknown"),
-            DatabaseFixtures.create_event_with_summary("Write", "Tool used: unknown"),  # Mismatch scenario
-        ]
+        return [dict(event) for event in _PROBLEMATIC_EVENTS]
     
     @staticmethod
     def correct_events_after_fix() -> List[Dict[str, Any]]:
         """Events as they should appear after the fix."""
-        return [
-            DatabaseFixtures.create_event_with_summary("Write", "Write: /test/file1.txt"),
-            DatabaseFixtures.create_event_with_summary("Read", "Read: /test/file2.txt"),
-            DatabaseFixtures.create_event_with_summary("Edit", "Edit: /test/file3.py"),
-            DatabaseFixtures.create_event_with_summary("Bash", "Bash: ls -la"),
-        ]
+        return [dict(event) for event in _CORRECT_EVENTS]
+
+# Built once; the methods above hand out shallow copies, so callers may
+# replace top-level fields but must not mutate the shared payload dicts
+_PROBLEMATIC_EVENTS = (
+    DatabaseFixtures.create_event_with_summary("unknown", "Tool used: unknown"),
+    DatabaseFixtures.create_event_with_summary("unknown", "Tool used: unknown"),
+    DatabaseFixtures.create_event_with_summary("Write", "Tool used: unknown"),  # Mismatch scenario
+)
+
+_CORRECT_EVENTS = (
+    DatabaseFixtures.create_event_with_summary("Write", "Write: /test/file1.txt"),
+    DatabaseFixtures.create_event_with_summary("Read", "Read: /test/file2.txt"),
+    DatabaseFixtures.create_event_with_summary("Edit", "Edit: /test/file3.py"),
+    DatabaseFixtures.create_event_with_summary("Bash", "Bash: ls -la"),
+)
+
+NEW_FORMAT_FIELDS = frozenset({"session_id", "tool_name", "tool_input", "tool_response"})
+LEGACY_FORMAT_FIELDS = frozenset({"session_id", "tool", "parameters", "tool_response"})
+UNKNOWN_TOOL_SUMMARY = "Tool used: unknown"
+_EMPTY: Dict[str, Any] = {}
 
 class TestDataValidator:
     """Validates test data meets regression prevention requirements."""
@@ -337,32 +398,18 @@ class TestDataValidator:
     @staticmethod
     def validate_hook_data(hook_data: Dict[str, Any]) -> bool:
         """Validate that hook data structure is correct."""
-        required_fields = ["session_id", "tool_name", "tool_input", "tool_response"]
-        
-        # Check for new format fields
-        has_new_format = all(field in hook_data for field in required_fields)
-        
-        # Check for legacy format fields
-        legacy_fields = ["session_id", "tool", "parameters", "tool_response"]
-        has_legacy_format = all(field in hook_data for field in legacy_fields)
-        
-        return has_new_format or has_legacy_format
+        # Either the new format or the legacy format fields must all be present
+        keys = hook_data.keys()
+        return NEW_FORMAT_FIELDS <= keys or LEGACY_FORMAT_FIELDS <= keys
     
     @staticmethod
     def validate_no_unknown_tools(events: List[Dict[str, Any]]) -> bool:
         """Validate that no events contain unknown tool names."""
-        for event in events:
-            payload = event.get("payload", {})
-            tool_name = payload.get("tool_name")
-            
-            if tool_name == "unknown":
-                return False
-            
-            summary = event.get("summary", "")
-            if "Tool used: unknown" in summary:
-                return False
-        
-        return True
+        return not any(
+            event.get("payload", _EMPTY).get("tool_name") == "unknown"
+            or UNKNOWN_TOOL_SUMMARY in event.get("summary", "")
+            for event in events
+        )
     
     @staticmethod
     def validate_timeout_handling(hook_data: Dict[str, Any]) -> bool:
@@ -380,20 +427,25 @@ class TestDataValidator:
         return True
 
 # Convenience functions for test files
+# The JSON strings are built once and shared; callers that need a fresh
+# session ID per call should use HookDataGenerator directly
+@lru_cache(maxsize=None)
 def get_write_test_data(include_timeout_content: bool = False) -> str:
     """Get JSON string of Write operation test data."""
     data = HookDataGenerator.write_operation(include_timeout_content=include_timeout_content)
-    return json.dumps(data)
+    return _dumps(data)
 
+@lru_cache(maxsize=None)
 def get_regression_scenario() -> str:
     """Get JSON string of the main regression scenario."""
     data = RegressionScenarios.screenshot_scenario()
-    return json.dumps(data)
+    return _dumps(data)
+
+_MIXED_BATCH_JSON = tuple(_dumps(data) for data in _MIXED_BATCH)
 
 def get_mixed_format_batch() -> List[str]:
     """Get list of JSON strings for mixed format testing."""
-    batch = RegressionScenarios.mixed_format_batch()
-    return [json.dumps(data) for data in batch]
+    return list(_MIXED_BATCH_JSON)
 
 if __name__ == "__main__":
     # Demo usage
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the hook worker server used by the integration test harnesses.
+"""
+
+import json
+import socket
+import sys
+import threading
+import time
+import pytest
+from pathlib import Path
+
+# Add the hooks directory to the path so we can import the utils package
+HOOKS_DIR = Path(__file__).resolve().parents[2] / ".claude" / "hooks"
+sys.path.insert(0, str(HOOKS_DIR))
+
+from utils.hook_server import get_serve_path, run_once, serve
+
+
+def echo_hook():
+    """Minimal hook: echo stdin to stdout, exit with the requested code."""
+    data = json.loads(sys.stdin.read())
+    print(data["message"])
+    print("to stderr", file=sys.stderr)
+    sys.exit(data.get("exit", 0))
+
+
+class TestGetServePath:
+    """Test --serve argument detection."""
+
+    def test_returns_socket_path(self):
+        assert get_serve_path(["hook.py", "--serve", "/tmp/hook.sock"]) == "/tmp/hook.sock"
+
+    def test_none_without_flag(self):
+        assert get_serve_path(["hook.py"]) is None
+
+    def test_none_without_path(self):
+        assert get_serve_path(["hook.py", "--serve"]) is None
+
+
+class TestRunOnce:
+    """Test single in-process hook invocations."""
+
+    def test_captures_output_and_exit_code(self):
+        result = run_once(echo_hook, json.dumps({"message": "hello", "exit": 2}))
+
+        assert result == {"stdout": "hello\n", "stderr": "to stderr\n", "returncode": 2}
+
+    def test_restores_stdio(self):
+        stdin, stdout, stderr = sys.stdin, sys.stdout, sys.stderr
+
+        run_once(echo_hook, json.dumps({"message": "hello"}))
+
+        assert (sys.stdin, sys.stdout, sys.stderr) == (stdin, stdout, stderr)
+
+    def test_unhandled_exception_returns_error(self):
+        result = run_once(echo_hook, "not json")
+
+        assert result["returncode"] == 1
+        assert "Unhandled hook error" in result["stderr"]
+
+
+class TestServe:
+    """Test the Unix socket request loop."""
+
+    def test_handles_multiple_requests_on_one_connection(self, tmp_path):
+        socket_path = tmp_path / "hook.sock"
+        threading.Thread(target=serve, args=(echo_hook, str(socket_path)), daemon=True).start()
+
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.settimeout(5)
+        for _ in range(500):
+            if socket_path.exists():
+                break
+            time.sleep(0.01)
+        client.connect(str(socket_path))
+
+        with client, client.makefile('rb') as reader:
+            for message in ("first", "second"):
+                client.sendall(json.dumps({"message": message}).encode() + b"\n")
+                response = json.loads(reader.readline())
+                assert response["stdout"] == f"{message}\n"
+                assert response["returncode"] == 0
+
+
+# Convenience function for running tests standalone
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -11,69 +11,117 @@ These tests verify that the complete event flow works correctly:
 Prevents regression where database contained incorrect event summaries.
 """
 
+import io
 import json
 import os
+import sqlite3
 import sys
 import pytest
-import tempfile
-import subprocess
 import time
+import uuid
 import requests
 from pathlib import Path
+from requests.adapters import HTTPAdapter
 from unittest.mock import patch
 
 # Add project paths
-PROJECT_ROOT = Path(__file__).parent.parent.parent
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
 HOOKS_DIR = PROJECT_ROOT / ".claude" / "hooks"
-SERVER_DIR = PROJECT_ROOT / "apps" / "server"
 sys.path.insert(0, str(HOOKS_DIR))
 
 from post_tool_use import main as post_tool_use_main
 
-class TestDatabaseIntegration:
-    """Test integration between hook and database storage."""
+# Core columns of the events table, as created by apps/server/src/db.ts
+EVENTS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_app TEXT NOT NULL,
+        session_id TEXT NOT NULL,
+        hook_event_type TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        chat TEXT,
+        summary TEXT,
+        timestamp INTEGER NOT NULL
+    )
+"""
+
+@pytest.fixture(scope="module", autouse=True)
+def _hook_env(tmp_path_factory):
+    """Point the hook at a test server URL, keep TTS quiet and send the
+    per-session logs to a temp dir instead of ./logs for the module."""
+    with patch.dict(os.environ, {
+        'OBSERVABILITY_SERVER_URL': 'http://localhost:4001',
+        'TTS_ENABLED': 'false'
+    }), patch('utils.constants.LOG_BASE_DIR', str(tmp_path_factory.mktemp('hook-logs'))):
+        yield
+
+@pytest.fixture
+def temp_db_file():
+    """Create a private in-memory events database for testing.
     
-    @pytest.fixture
-    def temp_db_file(self):
-        """Create a temporary database file for testing."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-        yield db_path
-        # Cleanup
-        if os.path.exists(db_path):
-            os.unlink(db_path)
+    Yields a shared-cache URI (open it with uri=True). The database lives
+    only while the fixture's own connection is open, so there is no file
+    to create or remove.
+    """
+    db_uri = f"file:testdb-{uuid.uuid4().hex}?mode=memory&cache=shared"
+    keeper = sqlite3.connect(db_uri, uri=True)
+    keeper.execute(EVENTS_SCHEMA)
+    keeper.commit()
+    yield db_uri
+    keeper.close()
+
+@pytest.fixture
+def db_conn(temp_db_file):
+    """One connection to the test database, shared by the fixture and test."""
+    conn = sqlite3.connect(temp_db_file, uri=True)
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def test_server(db_conn):
+    """Stand in for the observability server, in-process.
     
-    @pytest.fixture
-    def test_server(self, temp_db_file):
-        """Start a test server instance with temporary database."""
-        # Change to server directory and start server with test database
-        original_cwd = os.getcwd()
-        os.chdir(SERVER_DIR)
-        
-        # Set environment to use test database
-        env = os.environ.copy()
-        env['DATABASE_PATH'] = temp_db_file
-        env['PORT'] = '4001'  # Use different port for testing
-        
-        # Start server process
-        server_process = subprocess.Popen(
-            ['bun', 'run', 'start'],
-            env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        
-        # Wait for server to start
-        time.sleep(3)
-        
-        yield 'http://localhost:4001'
-        
-        # Cleanup
-        server_process.terminate()
-        server_process.wait()
-        os.chdir(original_cwd)
+    Events the hook would POST are inserted into the temporary database the
+    way the server's insertEvent stores them, without starting the Bun
+    server or binding a port.
+    """
+    def insert_event(event_data, timeout=None):
+        with db_conn:
+            db_conn.execute(
+                "INSERT INTO events (source_app, session_id, hook_event_type, payload, chat, summary, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    event_data["source_app"],
+                    event_data["session_id"],
+                    event_data["hook_event_type"],
+                    json.dumps(event_data["payload"]),
+                    json.dumps(event_data["chat"]) if event_data.get("chat") else None,
+                    event_data.get("summary"),
+                    event_data.get("timestamp") or int(time.time() * 1000)
+                )
+            )
+        return True
+    
+    with patch('utils.http_client.send_event_to_server', side_effect=insert_event):
+        yield db_conn
+
+def run_hook(hook_input):
+    """Run the post_tool_use hook on hook_input as Claude Code would.
     
-    def test_write_tool_creates_correct_database_entry(self, temp_db_file):
+    The hook normally takes its session ID from the stored session file
+    rather than its input; here it keeps the input's session_id so tests
+    can find their events. The server-side session_id is that value plus
+    the "_<pid>_<time>" suffix added by create_hook_event.
+    """
+    with patch('sys.stdin', io.StringIO(json.dumps(hook_input))), \
+            patch('post_tool_use.get_stored_session_id', return_value=hook_input["session_id"]), \
+            patch('sys.exit'):  # Prevent actual exit
+        post_tool_use_main()
+
+class TestDatabaseIntegration:
+    """Test integration between hook and database storage."""
+    
+    def test_write_tool_creates_correct_database_entry(self, db_conn, test_server):
         """Test that Write tool operations create correct database entries."""
         # Simulate hook input for Write operation
         hook_input = {
@@ -92,19 +140,10 @@ class TestDatabaseIntegration:
             }
         }
         
-        # Mock environment variables for testing
-        with patch.dict(os.environ, {
-            'OBSERVABILITY_SERVER_URL': 'http://localhost:4001',
-            'TTS_ENABLED': 'false'
-        }):
-            with patch('sys.stdin', new_callable=lambda: tempfile.StringIO(json.dumps(hook_input))):
-                with patch('sys.exit'):  # Prevent actual exit
-                    post_tool_use_main()
+        run_hook(hook_input)
         
         # Verify database entry was created correctly
-        import sqlite3
-        conn = sqlite3.connect(temp_db_file)
-        cursor = conn.cursor()
+        cursor = db_conn.cursor()
         
         cursor.execute("SELECT summary, hook_event_type, payload FROM events ORDER BY id DESC LIMIT 1")
         row = cursor.fetchone()
@@ -117,10 +156,8 @@ class TestDatabaseIntegration:
         assert "Tool used: Write" in summary or "Write:" in summary
         assert "Tool used: unknown" not in summary
         assert payload.get("tool_name") == "Write"
-        
-        conn.close()
     
-    def test_read_tool_with_timeout_content_no_false_error(self, temp_db_file):
+    def test_read_tool_with_timeout_content_no_false_error(self, db_conn, test_server):
         """Test that reading files with timeout content doesn't create error events."""
         hook_input = {
             "session_id": "test-session-456",
@@ -137,18 +174,7 @@ class TestDatabaseIntegration:
             }
         }
         
-        with patch.dict(os.environ, {
-            'OBSERVABILITY_SERVER_URL': 'http://localhost:4001',
-            'TTS_ENABLED': 'false'
-        }):
-            with patch('sys.stdin', new_callable=lambda: tempfile.StringIO(json.dumps(hook_input))):
-                with patch('sys.exit'):
-                    post_tool_use_main()
-        
-        # Verify no error events were created
-        import sqlite3
-        conn = sqlite3.connect(temp_db_file)
-        cursor = conn.cursor()
+        run_hook(hook_input)
         
         # Check that no error logs were created
         error_log_dir = PROJECT_ROOT / "logs" / "hooks" / "post_tool_use_errors"
@@ -160,10 +186,8 @@ class TestDatabaseIntegration:
                             error_event = json.loads(line)
                             # Ensure this test didn't create any error events
                             assert error_event.get('tool') != 'Read' or 'timeout_config.py' not in str(error_event)
-        
-        conn.close()
     
-    def test_multiple_tool_types_all_extracted_correctly(self, temp_db_file):
+    def test_multiple_tool_types_all_extracted_correctly(self, db_conn, test_server):
         """Test that various tool types are all extracted and stored correctly."""
         test_tools = [
             {
@@ -191,20 +215,12 @@ class TestDatabaseIntegration:
                 **tool_data
             }
             
-            with patch.dict(os.environ, {
-                'OBSERVABILITY_SERVER_URL': 'http://localhost:4001',
-                'TTS_ENABLED': 'false'
-            }):
-                with patch('sys.stdin', new_callable=lambda: tempfile.StringIO(json.dumps(hook_input))):
-                    with patch('sys.exit'):
-                        post_tool_use_main()
+            run_hook(hook_input)
         
         # Verify all tools were stored correctly
-        import sqlite3
-        conn = sqlite3.connect(temp_db_file)
-        cursor = conn.cursor()
+        cursor = db_conn.cursor()
         
-        cursor.execute("SELECT payload FROM events WHERE session_id LIKE ? ORDER BY id", (f"{session_base}%",))
+        cursor.execute("SELECT payload FROM events WHERE session_id LIKE ? ORDER BY id", (f"{session_base}-%",))
         rows = cursor.fetchall()
         
         assert len(rows) == len(test_tools)
@@ -216,18 +232,25 @@ class TestDatabaseIntegration:
             assert payload.get("tool_name") == expected_tool
             # Ensure no tool was marked as unknown
             assert payload.get("tool_name") != "unknown"
-        
-        conn.close()
+
+@pytest.fixture(scope="module")
+def http():
+    """Pooled HTTP session, so API tests reuse one keep-alive connection."""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    session.headers.update({"Content-Type": "application/json"})
+    yield session
+    session.close()
 
 class TestServerAPIIntegration:
     """Test integration with the observability server API."""
     
     @pytest.fixture
-    def test_server_url(self):
+    def test_server_url(self, http):
         """Use the main test server if running, otherwise skip."""
         url = "http://localhost:4000"
         try:
-            response = requests.get(url, timeout=1)
+            response = http.get(url, timeout=1)
             if response.status_code == 200:
                 return url
             else:
@@ -235,7 +258,7 @@ class TestServerAPIIntegration:
         except requests.exceptions.RequestException:
             pytest.skip("Test server not available")
     
-    def test_api_receives_correct_tool_events(self, test_server_url):
+    def test_api_receives_correct_tool_events(self, http, test_server_url):
         """Test that the API receives events with correct tool names."""
         test_event = {
             "source_app": "test-suite",
@@ -253,17 +276,16 @@ class TestServerAPIIntegration:
         }
         
         # Send event to server
-        response = requests.post(
+        response = http.post(
             f"{test_server_url}/events",
             json=test_event,
-            headers={"Content-Type": "application/json"},
             timeout=5
         )
         
         assert response.status_code == 200
         
         # Retrieve recent events and verify
-        response = requests.get(f"{test_server_url}/events/recent?limit=1", timeout=5)
+        response = http.get(f"{test_server_url}/events/recent?limit=1", timeout=5)
         assert response.status_code == 200
         
         events = response.json()
@@ -274,9 +296,9 @@ class TestServerAPIIntegration:
         assert "Tool used: Write" in latest_event["summary"]
         assert "Tool used: unknown" not in latest_event["summary"]
     
-    def test_api_returns_correct_filter_options(self, test_server_url):
+    def test_api_returns_correct_filter_options(self, http, test_server_url):
         """Test that filter options include tool names correctly."""
-        response = requests.get(f"{test_server_url}/events/filter-options", timeout=5)
+        response = http.get(f"{test_server_url}/events/filter-options", timeout=5)
         assert response.status_code == 200
         
         filter_options = response.json()
@@ -292,7 +314,7 @@ class TestServerAPIIntegration:
 class TestEndToEndRegression:
     """End-to-end tests that simulate the exact regression scenario."""
     
-    def test_write_operation_full_pipeline(self, temp_db_file):
+    def test_write_operation_full_pipeline(self, db_conn, test_server):
         """Test complete pipeline: hook -> database -> API -> UI data."""
         # Step 1: Simulate hook processing a Write operation
         hook_input = {
@@ -312,30 +334,30 @@ class TestEndToEndRegression:
         }
         
         # Step 2: Process through hook
-        with patch.dict(os.environ, {
-            'OBSERVABILITY_SERVER_URL': 'http://localhost:4001',
-            'TTS_ENABLED': 'false'
-        }):
-            with patch('sys.stdin', new_callable=lambda: tempfile.StringIO(json.dumps(hook_input))):
-                with patch('sys.exit'):
-                    post_tool_use_main()
+        run_hook(hook_input)
         
         # Step 3: Verify database contains correct data
-        import sqlite3
-        conn = sqlite3.connect(temp_db_file)
-        cursor = conn.cursor()
+        cursor = db_conn.cursor()
         
+        # The latest event plus a count of any error events, in one query
         cursor.execute("""
-            SELECT summary, payload, hook_event_type 
+            SELECT summary, payload, hook_event_type, (
+                SELECT COUNT(*) FROM events 
+                WHERE session_id LIKE :session_pattern AND (
+                    summary LIKE '%error%' OR 
+                    summary LIKE '%timeout%' OR
+                    summary LIKE '%unknown%'
+                )
+            )
             FROM events 
-            WHERE session_id = ? 
+            WHERE session_id LIKE :session_pattern 
             ORDER BY id DESC LIMIT 1
-        """, ("e2e-test-session",))
+        """, {"session_pattern": "e2e-test-session_%"})
         
         row = cursor.fetchone()
         assert row is not None
         
-        summary, payload_json, hook_event_type = row
+        summary, payload_json, hook_event_type, error_count = row
         payload = json.loads(payload_json)
         
         # Critical regression checks - these exact issues were in the screenshots
@@ -344,20 +366,9 @@ class TestEndToEndRegression:
         assert "unknown" not in summary.lower()
         
         # Step 4: Verify no error events were created
-        error_count = cursor.execute("""
-            SELECT COUNT(*) FROM events 
-            WHERE session_id = ? AND (
-                summary LIKE '%error%' OR 
-                summary LIKE '%timeout%' OR
-                summary LIKE '%unknown%'
-            )
-        """, ("e2e-test-session",)).fetchone()[0]
-        
         assert error_count == 0
-        
-        conn.close()
     
-    def test_no_tool_used_unknown_in_any_events(self, temp_db_file):
+    def test_no_tool_used_unknown_in_any_events(self, db_conn, test_server):
         """Test that no events contain 'Tool used: unknown' after processing."""
         # Process several different tool operations
         test_operations = [
@@ -383,18 +394,10 @@ class TestEndToEndRegression:
         
         # Process all operations
         for operation in test_operations:
-            with patch.dict(os.environ, {
-                'OBSERVABILITY_SERVER_URL': 'http://localhost:4001',
-                'TTS_ENABLED': 'false'
-            }):
-                with patch('sys.stdin', new_callable=lambda: tempfile.StringIO(json.dumps(operation))):
-                    with patch('sys.exit'):
-                        post_tool_use_main()
+            run_hook(operation)
         
         # Verify no "Tool used: unknown" events exist
-        import sqlite3
-        conn = sqlite3.connect(temp_db_file)
-        cursor = conn.cursor()
+        cursor = db_conn.cursor()
         
         unknown_count = cursor.execute("""
             SELECT COUNT(*) FROM events 
@@ -415,8 +418,6 @@ class TestEndToEndRegression:
             
             assert tool_name != "unknown", f"Tool name is unknown in session {session_id}"
             assert tool_name in ["Write", "Read", "Edit"], f"Unexpected tool name: {tool_name}"
-        
-        conn.close()
 
 if __name__ == "__main__":
     # Run integration tests
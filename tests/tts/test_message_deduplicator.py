@@ -11,23 +11,24 @@ import pytest
 from pathlib import Path
 
 # Add hooks to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / ".claude" / "hooks"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / ".claude" / "hooks"))
 
 from utils.tts.message_deduplicator import MessageDeduplicator
 
 
-@pytest.fixture
-def deduplicator():
-    """Create a fresh MessageDeduplicator instance for each test."""
-    # Use a test-specific cache file
-    test_cache = Path("/tmp/tts-queue/test-message-cache.json")
-    dedup = MessageDeduplicator(cache_file=test_cache)
+@pytest.fixture(scope="module")
+def deduplicator(tmp_path_factory):
+    """One MessageDeduplicator shared by the module, reset between tests."""
+    # tmp_path_factory gives each (xdist) worker its own directory
+    test_cache = tmp_path_factory.mktemp("tts-queue") / "test-message-cache.json"
+    return MessageDeduplicator(cache_file=test_cache)
 
-    yield dedup
 
-    # Cleanup after test
-    if test_cache.exists():
-        test_cache.unlink()
+@pytest.fixture(autouse=True)
+def _reset_deduplicator(deduplicator):
+    """Start every test from an empty deduplicator and cache file."""
+    yield
+    deduplicator.reset()
 
 
 class TestMessageDeduplication:
@@ -82,6 +83,11 @@ class TestCategoryCooldowns:
         assert error_cooldown == 60  # 1 minute
         assert session_cooldown == 300  # 5 minutes
 
+    def test_cooldowns_are_read_only(self, deduplicator):
+        """Test that the shared cooldown table cannot be changed per instance."""
+        with pytest.raises(TypeError):
+            deduplicator.category_cooldowns["error"] = 0
+
     def test_category_detection_from_message(self, deduplicator):
         """Test automatic category detection from message content."""
         # Session completion
@@ -99,6 +105,67 @@ class TestCategoryCooldowns:
         assert len(categories) >= 1
 
 
+class TestCategoryRateLimiting:
+    """Test per-category token bucket rate limiting."""
+
+    def test_burst_within_capacity_speaks(self, deduplicator):
+        """Test that distinct messages up to the bucket capacity all speak."""
+        capacity, _ = deduplicator.category_rate_limits["error"]
+
+        for i in range(capacity):
+            should_speak, reason = deduplicator.should_speak(f"Error {i}", {"category": "error"})
+            assert should_speak is True
+            assert reason is None
+
+    def test_burst_over_capacity_blocks(self, deduplicator):
+        """Test that distinct messages beyond the bucket capacity are blocked."""
+        capacity, _ = deduplicator.category_rate_limits["error"]
+
+        for i in range(capacity):
+            deduplicator.should_speak(f"Error {i}", {"category": "error"})
+
+        should_speak, reason = deduplicator.should_speak("One error too many", {"category": "error"})
+        assert should_speak is False
+        assert "rate limit" in reason.lower()
+        assert "error" in reason
+
+    def test_rate_limit_is_per_category(self, deduplicator):
+        """Test that exhausting one category does not block another."""
+        capacity, _ = deduplicator.category_rate_limits["error"]
+
+        for i in range(capacity + 1):
+            deduplicator.should_speak(f"Error {i}", {"category": "error"})
+
+        should_speak, _ = deduplicator.should_speak("Session completed", {"category": "session_completion"})
+        assert should_speak is True
+
+    def test_bucket_refills_over_time(self, deduplicator):
+        """Test that an exhausted bucket refills after its period elapses."""
+        capacity, period = deduplicator.category_rate_limits["error"]
+
+        for i in range(capacity):
+            deduplicator.should_speak(f"Error {i}", {"category": "error"})
+
+        # Pretend the bucket was last refilled a full period ago
+        tokens, last_refill = deduplicator._buckets["error"]
+        deduplicator._buckets["error"] = (tokens, last_refill - period)
+
+        should_speak, _ = deduplicator.should_speak("Error after refill", {"category": "error"})
+        assert should_speak is True
+
+    def test_buckets_persist_across_instances(self, deduplicator):
+        """Test that bucket state survives a reload from the cache file."""
+        capacity, _ = deduplicator.category_rate_limits["error"]
+
+        for i in range(capacity):
+            deduplicator.should_speak(f"Error {i}", {"category": "error"})
+
+        reloaded = MessageDeduplicator(cache_file=deduplicator.cache_file)
+        should_speak, reason = reloaded.should_speak("Error from new process", {"category": "error"})
+        assert should_speak is False
+        assert "rate limit" in reason.lower()
+
+
 class TestStatistics:
     """Test deduplication statistics."""
 
@@ -147,9 +214,9 @@ class TestPersistence:
         # Check that cache file was created
         assert deduplicator.cache_file.exists()
 
-    def test_cache_loads_from_file(self):
+    def test_cache_loads_from_file(self, tmp_path):
         """Test that cache loads from existing file."""
-        test_cache = Path("/tmp/tts-queue/test-persistence-cache.json")
+        test_cache = tmp_path / "test-persistence-cache.json"
 
         # Create first deduplicator and add message
         dedup1 = MessageDeduplicator(cache_file=test_cache)
@@ -162,9 +229,51 @@ class TestPersistence:
         stats = dedup2.get_stats()
         assert stats["total_records"] >= 1
 
-        # Cleanup
-        if test_cache.exists():
-            test_cache.unlink()
+    def test_suppressed_repeats_saved_on_flush(self, deduplicator):
+        """Test that repeat counts are batched until flush() writes them."""
+        msg = "Batched repeat"
+        ctx = {"category": "general"}
+
+        deduplicator.should_speak(msg, ctx)
+        deduplicator.should_speak(msg, ctx)
+
+        # The spoken message is on disk, the suppressed repeat is not yet
+        before = MessageDeduplicator(cache_file=deduplicator.cache_file)
+        assert before.get_stats()["by_category"]["general"]["total_duplicates"] == 0
+
+        deduplicator.flush()
+
+        after = MessageDeduplicator(cache_file=deduplicator.cache_file)
+        assert after.get_stats()["by_category"]["general"]["total_duplicates"] == 1
+
+
+    def test_reset_clears_records_and_cache(self, deduplicator):
+        """Test that reset() forgets records in memory and on disk."""
+        msg = "Forgotten message"
+        ctx = {"category": "general"}
+
+        deduplicator.should_speak(msg, ctx)
+        deduplicator.reset()
+
+        assert deduplicator.get_stats()["total_records"] == 0
+        reloaded = MessageDeduplicator(cache_file=deduplicator.cache_file)
+        assert reloaded.get_stats()["total_records"] == 0
+
+        should_speak, _ = deduplicator.should_speak(msg, ctx)
+        assert should_speak is True
+
+    def test_persist_false_never_touches_cache_file(self, tmp_path):
+        """Test that an in-memory deduplicator neither reads nor writes its cache."""
+        test_cache = tmp_path / "memory-only-cache.json"
+        MessageDeduplicator(cache_file=test_cache).should_speak("On disk", {"category": "general"})
+
+        dedup = MessageDeduplicator(cache_file=test_cache, persist=False)
+        assert dedup.get_stats()["total_records"] == 0
+
+        before = test_cache.read_bytes()
+        dedup.should_speak("In memory only", {"category": "general"})
+        dedup.flush()
+        assert test_cache.read_bytes() == before
 
 
 class TestCleanup:
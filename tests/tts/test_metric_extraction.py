@@ -7,10 +7,23 @@ actionable metrics (files, tests, errors, duration) from hook event context.
 """
 
 import pytest
-from typing import Dict, Any
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, Optional
 
 
-def extract_metrics(context: Dict[str, Any]) -> Dict[str, Any]:
+@dataclass(slots=True)
+class Metrics:
+    """Actionable metrics extracted from hook event context."""
+    files: int = 0
+    tests: int = 0
+    errors: int = 0
+    duration: Optional[int] = None
+    items: int = 0
+    changes: int = 0
+
+
+def extract_metrics(context: Dict[str, Any]) -> Metrics:
     """
     Extract actionable metrics from context for inclusion in TTS.
 
@@ -20,84 +33,88 @@ def extract_metrics(context: Dict[str, Any]) -> Dict[str, Any]:
         context: Rich context data from hooks
 
     Returns:
-        Dict with extracted metrics: files, tests, errors, duration, items, changes
+        Metrics with files, tests, errors, duration, items, changes
     """
-    metrics = {
-        "files": 0,
-        "tests": 0,
-        "errors": 0,
-        "duration": None,
-        "items": 0,
-        "changes": 0
-    }
+    files = tests = errors = 0
+    duration = None
 
     # Extract from context field
     ctx = context.get("context", {})
     if isinstance(ctx, dict):
-        metrics["files"] = ctx.get("files_affected", 0)
-        metrics["errors"] = ctx.get("error_count", 0)
+        files = ctx.get("files_affected", 0)
+        errors = ctx.get("error_count", 0)
 
     # Extract from metrics field
     metric_data = context.get("metrics", {})
     if isinstance(metric_data, dict):
-        metrics["duration"] = metric_data.get("duration_ms")
-        if "error" in metric_data.get("severity", "").lower():
-            metrics["errors"] = max(metrics["errors"], 1)
+        duration = metric_data.get("duration_ms")
+        severity = metric_data.get("severity")
+        if severity and "error" in severity.lower():
+            errors = max(errors, 1)
 
     # Extract from payload (for hook events)
     payload = context.get("payload", {})
     if isinstance(payload, dict):
-        # Test results
-        if "tests_run" in payload:
-            metrics["tests"] = payload.get("tests_run", 0)
-        if "tests_passed" in payload:
-            metrics["tests"] = payload.get("tests_passed", 0)
-
-        # File operations
-        if "files_affected" in payload:
-            metrics["files"] = payload.get("files_affected", 0)
+        # Test results: tests_passed wins over tests_run
+        tests = payload.get("tests_passed", payload.get("tests_run", 0))
+
+        # File operations: files_affected replaces the context count,
+        # files_modified only raises it
+        files = payload.get("files_affected", files)
         if "files_modified" in payload:
-            metrics["files"] = max(metrics["files"], payload.get("files_modified", 0))
+            files = max(files, payload["files_modified"])
 
         # Error tracking
-        if "error_occurred" in payload and payload["error_occurred"]:
-            metrics["errors"] += 1
+        if payload.get("error_occurred"):
+            errors += 1
 
         # Duration
-        if "duration_ms" in payload:
-            metrics["duration"] = payload.get("duration_ms")
+        duration = payload.get("duration_ms", duration)
 
     # Extract from error_info
     error_info = context.get("error_info", {})
     if isinstance(error_info, dict) and error_info.get("has_error"):
-        metrics["errors"] = max(metrics["errors"], 1)
+        errors = max(errors, 1)
+
+    return Metrics(files=files, tests=tests, errors=errors, duration=duration)
+
+
+# Singular nouns for the (files, tests, errors) counts, in display order
+COUNT_NOUNS = ("file", "test", "error")
+
+
+@lru_cache(maxsize=256)
+def _format_metric_hints(files: int, tests: int, errors: int, duration: Optional[int]) -> str:
+    """Format hints for one metric combination; memoized, as events repeat."""
+    # The suffix table picks "s" for counts above one
+    metric_hints = [
+        f"{count} {noun}{('', 's')[count > 1]}"
+        for count, noun in zip((files, tests, errors), COUNT_NOUNS)
+        if count > 0
+    ]
+
+    if duration and duration > 5000:  # Over 5 seconds
+        duration_sec = int(duration / 1000)
+        metric_hints.append(f"{duration_sec}s")
 
-    return metrics
+    return ", ".join(metric_hints)
 
 
-def build_metric_hints(metrics: Dict[str, Any]) -> str:
+def build_metric_hints(metrics: Metrics) -> str:
     """
     Build metric context string for AI prompt.
 
     Args:
-        metrics: Extracted metrics dict
+        metrics: Extracted metrics
 
     Returns:
         Comma-separated string of metrics (e.g., "3 files, 12 tests")
     """
-    metric_hints = []
-
-    if metrics["files"] > 0:
-        metric_hints.append(f"{metrics['files']} file{'s' if metrics['files'] > 1 else ''}")
-    if metrics["tests"] > 0:
-        metric_hints.append(f"{metrics['tests']} test{'s' if metrics['tests'] > 1 else ''}")
-    if metrics["errors"] > 0:
-        metric_hints.append(f"{metrics['errors']} error{'s' if metrics['errors'] > 1 else ''}")
-    if metrics["duration"] and metrics["duration"] > 5000:  # Over 5 seconds
-        duration_sec = int(metrics["duration"] / 1000)
-        metric_hints.append(f"{duration_sec}s")
+    # Routine events carry no metrics at all; not worth a cache entry
+    if not (metrics.files or metrics.tests or metrics.errors or metrics.duration):
+        return ""
 
-    return ", ".join(metric_hints) if metric_hints else ""
+    return _format_metric_hints(metrics.files, metrics.tests, metrics.errors, metrics.duration)
 
 
 class TestMetricExtraction:
@@ -116,9 +133,9 @@ class TestMetricExtraction:
 
         metrics = extract_metrics(context)
 
-        assert metrics["tests"] == 12
-        assert metrics["files"] == 3
-        assert metrics["errors"] == 0
+        assert metrics.tests == 12
+        assert metrics.files == 3
+        assert metrics.errors == 0
 
     def test_code_review_with_files(self):
         """Test extraction from code review with files and duration."""
@@ -134,9 +151,9 @@ class TestMetricExtraction:
 
         metrics = extract_metrics(context)
 
-        assert metrics["files"] == 5
-        assert metrics["duration"] == 8500
-        assert metrics["errors"] == 0
+        assert metrics.files == 5
+        assert metrics.duration == 8500
+        assert metrics.errors == 0
 
     def test_build_with_errors(self):
         """Test extraction from build failure with errors."""
@@ -153,9 +170,9 @@ class TestMetricExtraction:
 
         metrics = extract_metrics(context)
 
-        assert metrics["files"] == 2
+        assert metrics.files == 2
         # Error from payload (1) + error from severity (1) = 2
-        assert metrics["errors"] >= 1
+        assert metrics.errors >= 1
 
     def test_session_completion_with_duration(self):
         """Test extraction from session completion with duration."""
@@ -168,8 +185,8 @@ class TestMetricExtraction:
 
         metrics = extract_metrics(context)
 
-        assert metrics["duration"] == 45000
-        assert metrics["errors"] == 0
+        assert metrics.duration == 45000
+        assert metrics.errors == 0
 
     def test_empty_context(self):
         """Test extraction from empty context."""
@@ -178,10 +195,10 @@ class TestMetricExtraction:
         metrics = extract_metrics(context)
 
         # Should return zeros/None for empty context
-        assert metrics["files"] == 0
-        assert metrics["tests"] == 0
-        assert metrics["errors"] == 0
-        assert metrics["duration"] is None
+        assert metrics.files == 0
+        assert metrics.tests == 0
+        assert metrics.errors == 0
+        assert metrics.duration is None
 
     def test_files_modified_takes_max(self):
         """Test that files_modified uses max() correctly."""
@@ -197,7 +214,7 @@ class TestMetricExtraction:
         metrics = extract_metrics(context)
 
         # Should take the max of the two values
-        assert metrics["files"] == 5
+        assert metrics.files == 5
 
     def test_error_from_error_info(self):
         """Test error extraction from error_info field."""
@@ -210,7 +227,7 @@ class TestMetricExtraction:
 
         metrics = extract_metrics(context)
 
-        assert metrics["errors"] >= 1
+        assert metrics.errors >= 1
 
 
 class TestMetricHints:
@@ -218,14 +235,7 @@ class TestMetricHints:
 
     def test_build_metric_hints_with_files_and_tests(self):
         """Test building metric hints with files and tests."""
-        metrics = {
-            "files": 3,
-            "tests": 12,
-            "errors": 0,
-            "duration": None,
-            "items": 0,
-            "changes": 0
-        }
+        metrics = Metrics(files=3, tests=12)
 
         hints = build_metric_hints(metrics)
 
@@ -234,14 +244,7 @@ class TestMetricHints:
 
     def test_build_metric_hints_with_errors(self):
         """Test building metric hints with errors."""
-        metrics = {
-            "files": 2,
-            "tests": 0,
-            "errors": 1,
-            "duration": None,
-            "items": 0,
-            "changes": 0
-        }
+        metrics = Metrics(files=2, errors=1)
 
         hints = build_metric_hints(metrics)
 
@@ -250,14 +253,7 @@ class TestMetricHints:
 
     def test_build_metric_hints_with_duration(self):
         """Test building metric hints with significant duration."""
-        metrics = {
-            "files": 5,
-            "tests": 0,
-            "errors": 0,
-            "duration": 8500,  # 8.5 seconds
-            "items": 0,
-            "changes": 0
-        }
+        metrics = Metrics(files=5, duration=8500)  # 8.5 seconds
 
         hints = build_metric_hints(metrics)
 
@@ -266,14 +262,7 @@ class TestMetricHints:
 
     def test_build_metric_hints_ignores_short_duration(self):
         """Test that short durations (<5s) are ignored."""
-        metrics = {
-            "files": 0,
-            "tests": 0,
-            "errors": 0,
-            "duration": 3000,  # 3 seconds (too short)
-            "items": 0,
-            "changes": 0
-        }
+        metrics = Metrics(duration=3000)  # 3 seconds (too short)
 
         hints = build_metric_hints(metrics)
 
@@ -281,14 +270,7 @@ class TestMetricHints:
 
     def test_build_metric_hints_empty(self):
         """Test building metric hints with no metrics."""
-        metrics = {
-            "files": 0,
-            "tests": 0,
-            "errors": 0,
-            "duration": None,
-            "items": 0,
-            "changes": 0
-        }
+        metrics = Metrics()
 
         hints = build_metric_hints(metrics)
 
@@ -297,14 +279,7 @@ class TestMetricHints:
     def test_singular_vs_plural(self):
         """Test singular vs plural forms in hints."""
         # Singular
-        metrics_singular = {
-            "files": 1,
-            "tests": 1,
-            "errors": 1,
-            "duration": None,
-            "items": 0,
-            "changes": 0
-        }
+        metrics_singular = Metrics(files=1, tests=1, errors=1)
 
         hints_singular = build_metric_hints(metrics_singular)
 
@@ -314,14 +289,7 @@ class TestMetricHints:
         assert "files" not in hints_singular  # Should not have plural
 
         # Plural
-        metrics_plural = {
-            "files": 2,
-            "tests": 2,
-            "errors": 2,
-            "duration": None,
-            "items": 0,
-            "changes": 0
-        }
+        metrics_plural = Metrics(files=2, tests=2, errors=2)
 
         hints_plural = build_metric_hints(metrics_plural)
 
@@ -351,8 +319,8 @@ class TestRealWorldScenarios:
         metrics = extract_metrics(context)
         hints = build_metric_hints(metrics)
 
-        assert metrics["tests"] == 15
-        assert metrics["files"] == 5
+        assert metrics.tests == 15
+        assert metrics.files == 5
         assert "15 tests" in hints
         assert "5 files" in hints
 
@@ -373,8 +341,8 @@ class TestRealWorldScenarios:
         metrics = extract_metrics(context)
         hints = build_metric_hints(metrics)
 
-        assert metrics["files"] == 2
-        assert metrics["errors"] >= 1
+        assert metrics.files == 2
+        assert metrics.errors >= 1
         assert "error" in hints.lower()
 
 
@@ -6,35 +6,29 @@ Tests the complete flow from hook event → AI enhancement → rate limiting →
 """
 
 import sys
-import json
-import subprocess
-import time
 import pytest
 from pathlib import Path
 
 # Add hooks to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / ".claude" / "hooks"))
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / ".claude" / "hooks" / "utils" / "tts"))
+HOOKS_DIR = Path(__file__).resolve().parents[2] / ".claude" / "hooks"
+sys.path.insert(0, str(HOOKS_DIR))
+sys.path.insert(0, str(HOOKS_DIR / "utils" / "tts"))
 
 from message_deduplicator import MessageDeduplicator
 
 
-@pytest.fixture
-def clean_deduplicator():
-    """Create clean deduplicator for integration tests."""
-    test_cache = Path("/tmp/tts-queue/integration-test-cache.json")
-
-    # Clean up before test
-    if test_cache.exists():
-        test_cache.unlink()
-
-    dedup = MessageDeduplicator(cache_file=test_cache)
+@pytest.fixture(scope="module")
+def shared_deduplicator(tmp_path_factory):
+    """One in-memory deduplicator for the module; nothing here checks the file."""
+    test_cache = tmp_path_factory.mktemp("dedup") / "integration-test-cache.json"
+    return MessageDeduplicator(cache_file=test_cache, persist=False)
 
-    yield dedup
 
-    # Clean up after test
-    if test_cache.exists():
-        test_cache.unlink()
+@pytest.fixture
+def clean_deduplicator(shared_deduplicator):
+    """Reset the shared deduplicator so each test starts clean."""
+    shared_deduplicator.reset()
+    return shared_deduplicator
 
 
 class TestSpeakAISummaryIntegration:
@@ -132,9 +126,9 @@ class TestMetricExtraction:
 
         metrics = extract_metrics(context)
 
-        assert metrics["tests"] == 12
-        assert metrics["files"] == 3
-        assert metrics["errors"] == 0
+        assert metrics.tests == 12
+        assert metrics.files == 3
+        assert metrics.errors == 0
 
     def test_extract_errors_from_multiple_sources(self):
         """Test extracting errors from multiple context sources."""
@@ -152,21 +146,14 @@ class TestMetricExtraction:
 
         metrics = extract_metrics(context)
 
-        assert metrics["files"] == 2
-        assert metrics["errors"] >= 1
+        assert metrics.files == 2
+        assert metrics.errors >= 1
 
     def test_metric_hints_generation(self):
         """Test generating metric hints for AI prompts."""
-        from tests.tts.test_metric_extraction import build_metric_hints
-
-        metrics = {
-            "files": 3,
-            "tests": 12,
-            "errors": 0,
-            "duration": 8500,
-            "items": 0,
-            "changes": 0
-        }
+        from tests.tts.test_metric_extraction import Metrics, build_metric_hints
+
+        metrics = Metrics(files=3, tests=12, duration=8500)
 
         hints = build_metric_hints(metrics)
 